@@ -0,0 +1,175 @@
+"""
+Async data-access layer over supabase_client.
+
+supabase-py's query builder is synchronous, so every helper here runs the
+matching supabase_client function in a worker thread. The event loop is never
+blocked on Supabase I/O, and independent reads can run at the same time. At
+most max_concurrency calls are in flight; the same number sizes the client's
+shared HTTP/2 keep-alive pool. The sync functions in supabase_client stay the
+single implementation and are what the tests exercise.
+
+The storage backend is pluggable: any module that implements BACKEND_FUNCTIONS
+with supabase_client's signatures (taking its client as the first argument)
+can stand in. STORAGE_BACKEND picks supabase_client or sqlite_store, a local
+SQLite stand-in for offline runs and benchmarks. Every call is counted and
+timed per function in AsyncSupabase.stats.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterable
+from itertools import islice
+from types import ModuleType
+from typing import TypeVar
+
+from supabase import Client
+
+import supabase_client as db
+from bet_index import BetPairIndex
+from config import BET_INSERT_CHUNK_SIZE, BET_INSERT_CONCURRENCY, STORAGE_BACKEND, SUPABASE_MAX_CONCURRENCY
+
+T = TypeVar("T")
+
+# The storage interface: every backend module provides these functions.
+BACKEND_FUNCTIONS = (
+    "connect",
+    "close",
+    "fetch_existing_events",
+    "fetch_events_changed_since",
+    "fetch_events_by_parent",
+    "insert_events",
+    "update_events",
+    "fetch_all_user_ids",
+    "fetch_existing_bet_pairs",
+    "fetch_unscored_resolved_event_ids",
+    "iter_event_bets",
+    "insert_bets",
+    "update_bets_points",
+)
+
+
+def default_backend() -> ModuleType:
+    """The backend module STORAGE_BACKEND selects."""
+    if STORAGE_BACKEND == "sqlite":
+        import sqlite_store
+        return sqlite_store
+    if STORAGE_BACKEND != "supabase":
+        raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r} (supabase or sqlite)")
+    return db
+
+
+class AsyncSupabase:
+    """Async wrappers for every storage helper, sharing one pooled client."""
+
+    def __init__(
+        self,
+        client: Client | None = None,
+        max_concurrency: int = SUPABASE_MAX_CONCURRENCY,
+        backend: ModuleType | None = None,
+    ):
+        self.backend = backend if backend is not None else default_backend()
+        self.client = client if client is not None else self.backend.connect(max_concurrency)
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.stats: dict[str, dict[str, float]] = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking call in a worker thread, within the concurrency limit."""
+        async with self._semaphore:
+            t0 = time.monotonic()
+            try:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            finally:
+                stat = self.stats[getattr(fn, "__name__", "call")]
+                stat["calls"] += 1
+                stat["seconds"] += time.monotonic() - t0
+
+    async def aclose(self) -> None:
+        """Close the backend client (the pooled HTTP client for Supabase)."""
+        await asyncio.to_thread(self.backend.close, self.client)
+
+    def summary(self) -> str:
+        """Calls and time per storage function, busiest first."""
+        ranked = sorted(self.stats.items(), key=lambda item: -item[1]["seconds"])
+        return " · ".join(f"{name} {s['calls']:.0f}× {s['seconds']:.2f}s" for name, s in ranked)
+
+    # -- events --
+
+    async def fetch_existing_events(self) -> list[dict]:
+        return await self.run(self.backend.fetch_existing_events, self.client)
+
+    async def fetch_events_changed_since(self, column: str, since: str) -> list[dict]:
+        return await self.run(self.backend.fetch_events_changed_since, self.client, column, since)
+
+    async def fetch_events_by_parent(self, parent_ids: list[str]) -> list[dict]:
+        return await self.run(self.backend.fetch_events_by_parent, self.client, parent_ids)
+
+    async def insert_events(self, events: list[dict]) -> list[dict]:
+        return await self.run(self.backend.insert_events, self.client, events)
+
+    async def update_events(self, updates: list[tuple[dict, dict]]) -> tuple[int, list[tuple[str, str]]]:
+        return await self.run(self.backend.update_events, self.client, updates)
+
+    # -- users --
+
+    async def fetch_all_user_ids(self) -> list[str]:
+        return await self.run(self.backend.fetch_all_user_ids, self.client)
+
+    # -- bets --
+
+    async def fetch_existing_bet_pairs(self) -> BetPairIndex:
+        return await self.run(self.backend.fetch_existing_bet_pairs, self.client)
+
+    async def fetch_unscored_resolved_event_ids(self) -> list[str]:
+        return await self.run(self.backend.fetch_unscored_resolved_event_ids, self.client)
+
+    async def iter_event_bets(self, event_ids: list[str]) -> AsyncIterator[tuple[str, list[dict]]]:
+        """Async version of supabase_client.iter_event_bets; groups arrive as pages load."""
+        groups = self.backend.iter_event_bets(self.client, event_ids)
+
+        def iter_event_bets():
+            return next(groups, None)
+
+        while (group := await self.run(iter_event_bets)) is not None:
+            yield group
+
+    async def insert_bets(self, bets: list[dict], skip_conflicts: bool = False) -> int:
+        return await self.run(self.backend.insert_bets, self.client, bets, skip_conflicts)
+
+    async def insert_bets_chunked(
+        self,
+        rows: Iterable[dict],
+        skip_conflicts: bool = False,
+        chunk_size: int = BET_INSERT_CHUNK_SIZE,
+        max_in_flight: int = BET_INSERT_CONCURRENCY,
+    ) -> tuple[int, int]:
+        """
+        Insert bet rows from a (lazy) iterable in chunks of chunk_size.
+
+        At most max_in_flight chunk inserts run at once, and the next chunk is
+        only pulled from rows when one of them finishes, so memory stays
+        bounded by chunk_size * max_in_flight rows however long rows is.
+        Returns (created, offered). If a chunk fails, the other in-flight
+        inserts are cancelled and the error is raised.
+        """
+        it = iter(rows)
+        limit = max(1, max_in_flight)
+        pending: set[asyncio.Task] = set()
+        created = offered = 0
+        try:
+            while chunk := list(islice(it, max(1, chunk_size))):
+                offered += len(chunk)
+                pending.add(asyncio.create_task(self.insert_bets(chunk, skip_conflicts)))
+                if len(pending) >= limit:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    created += sum(task.result() for task in done)
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                created += sum(task.result() for task in done)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        return created, offered
+
+    async def update_bets_points(self, updates: list[tuple[str, dict]]) -> int:
+        return await self.run(self.backend.update_bets_points, self.client, updates)
@@ -0,0 +1,80 @@
+"""
+On-disk cache for BallDontLie responses.
+
+Each GET (path + query params) is stored as one pickle file holding the decoded
+JSON body, the response's validators (ETag / Last-Modified) and an expiry time:
+
+    {"body": {...}, "etag": '"abc"', "last_modified": "...", "expires_at": 1.7e9}
+
+A fresh entry is returned without touching the network or decoding JSON. A
+stale entry with validators is revalidated with If-None-Match /
+If-Modified-Since, and a 304 reuses the stored body. Entries with an infinite
+expiry (pages of a finished date range where every game is Final) never go
+stale. The expiry for each page is decided by the caller; see
+bdl_client.page_cache_ttl, which bdl_client.iter_bdl_game_pages applies to
+every /games page.
+"""
+import hashlib
+import json
+import math
+import os
+import pickle
+import time
+from pathlib import Path
+
+from config import BDL_CACHE_DIR
+
+
+class ResponseCache:
+    """Pickle-per-request response cache with hit / miss / revalidation counters."""
+
+    def __init__(self, directory: str | Path = BDL_CACHE_DIR):
+        self.directory = Path(directory)
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+
+    def lookup(self, path: str, params: dict | None) -> tuple[dict | None, bool]:
+        """
+        Return (entry, fresh). entry is None when nothing usable is stored;
+        fresh is True when the entry can be served without a request. The
+        caller records the outcome in self.stats.
+        """
+        try:
+            with open(self._file(path, params), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None, False
+        return entry, time.time() < entry.get("expires_at", 0)
+
+    def store(
+        self,
+        path: str,
+        params: dict | None,
+        body: dict,
+        ttl: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Atomically write an entry that expires ttl seconds from now (math.inf = never)."""
+        if ttl <= 0 and not (etag or last_modified):
+            return  # nothing to gain: it would be stale immediately and cannot be revalidated
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": math.inf if math.isinf(ttl) else time.time() + ttl,
+        }
+        target = self._file(path, params)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+        self.stats["stores"] += 1
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"cache {s['hits']} hit · {s['revalidated']} revalidated · {s['misses']} miss"
+
+    def _file(self, path: str, params: dict | None) -> Path:
+        key = json.dumps([path, sorted((params or {}).items())], default=str)
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.pkl"
@@ -1,41 +1,289 @@
+import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
 import httpx
 
-from config import BDL_BASE_URL, BDL_SEASON, BALL_DONT_LIE_API_KEY, ROUND_DATE_RANGES
+from config import (
+    BDL_BASE_URL, BDL_SEASON, BALL_DONT_LIE_API_KEY, ROUND_DATE_RANGES,
+    BDL_REQUESTS_PER_MINUTE, BDL_BURST, BDL_MAX_RETRIES, BDL_BACKOFF_BASE_S, BDL_BACKOFF_MAX_S,
+    BDL_REQUEST_BUDGET, BDL_CACHE_TTL_S, BDL_CACHE_PAST_TTL_S,
+)
+from bdl_cache import ResponseCache
 
 # First day of the play-in — only games from this date onwards are fetched.
 PLAYOFFS_START_DATE = ROUND_DATE_RANGES[0][1]  # "2026-04-14"
 
+# Responses worth retrying: rate limited, or a transient server-side failure.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class BdlBudgetExceeded(RuntimeError):
+    """Raised when a run would exceed BDL_REQUEST_BUDGET requests."""
+
+
+class TokenBucket:
+    """
+    Async token bucket: refills at `rate` tokens per second up to `capacity`.
+    acquire() waits until a token is available, so callers are paced to the
+    configured rate without ever sending a request that is bound to be throttled.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, sleep: Callable[[float], Awaitable[None]] = asyncio.sleep) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def drain(self) -> None:
+        """Empty the bucket (after a 429) so the next requests are paced from zero."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class BdlClient:
+    """
+    Shared BallDontLie client: one httpx.AsyncClient, one token bucket and one
+    request budget for every BDL endpoint used during a run.
+
+        async with BdlClient() as bdl:
+            body = await bdl.get("/games", params)
+
+    429 / 5xx responses and network errors are retried up to max_retries
+    times, waiting for Retry-After when the server sends it and for jittered
+    exponential backoff otherwise; either wait is capped at backoff_max_s. Once retries run out the last status error
+    is raised as httpx.HTTPStatusError, as before.
 
-async def fetch_bdl_games(client: httpx.AsyncClient) -> list[dict]:
+    Pass a ResponseCache (bdl_cache.py) to serve requests made with a
+    cache_ttl from disk.
     """
-    Fetch all play-in + playoff games from BallDontLie for the configured season.
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        requests_per_minute: float = BDL_REQUESTS_PER_MINUTE,
+        burst: int = BDL_BURST,
+        max_retries: int = BDL_MAX_RETRIES,
+        backoff_base_s: float = BDL_BACKOFF_BASE_S,
+        backoff_max_s: float = BDL_BACKOFF_MAX_S,
+        request_budget: int = BDL_REQUEST_BUDGET,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        cache: ResponseCache | None = None,
+    ):
+        self._client = client if client is not None else httpx.AsyncClient(timeout=30.0)
+        self.cache = cache
+        self._bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self._sleep = sleep
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.request_budget = request_budget
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Start a new run: zero the counters the request budget is checked against."""
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "waited_s": 0.0}
+        if self.cache is not None:
+            self.cache.stats = dict.fromkeys(self.cache.stats, 0)
+
+    async def __aenter__(self) -> "BdlClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def get(
+        self,
+        path: str,
+        params: dict | None = None,
+        cache_ttl: Callable[[dict], float] | None = None,
+    ) -> dict:
+        """
+        GET BDL_BASE_URL + path and return the decoded JSON body.
+
+        With a cache and cache_ttl, a fresh cached body is returned without a
+        request, a stale one is revalidated with its ETag / Last-Modified, and
+        a new body is stored for cache_ttl(body) seconds (math.inf = forever).
+        """
+        if self.cache is None or cache_ttl is None:
+            return (await self._get_with_retry(path, params)).json()
+
+        entry, fresh = self.cache.lookup(path, params)
+        if fresh:
+            self.cache.stats["hits"] += 1
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = await self._get_with_retry(path, params, headers)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats["revalidated"] += 1
+            body = entry["body"]
+        else:
+            self.cache.stats["misses"] += 1
+            body = response.json()
+        self.cache.store(
+            path, params, body, cache_ttl(body),
+            etag=response.headers.get("ETag") or (entry or {}).get("etag"),
+            last_modified=response.headers.get("Last-Modified") or (entry or {}).get("last_modified"),
+        )
+        return body
+
+    async def _get_with_retry(
+        self, path: str, params: dict | None, headers: dict | None = None
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._send(path, params, headers)
+                if response.status_code == 304:
+                    return response
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response
+                if response.status_code == 429:
+                    self.stats["throttled"] += 1
+                    self._bucket.drain()
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+
+            attempt += 1
+            self.stats["retries"] += 1
+            delay = _retry_after(response) if response is not None else None
+            if delay is None:
+                delay = self._backoff(attempt)
+            delay = min(delay, self.backoff_max_s)
+            self.stats["waited_s"] += delay
+            await self._sleep(delay)
+
+    async def _send(self, path: str, params: dict | None, headers: dict | None) -> httpx.Response:
+        if self.request_budget and self.stats["requests"] >= self.request_budget:
+            raise BdlBudgetExceeded(
+                f"BallDontLie request budget of {self.request_budget} exhausted"
+            )
+        t0 = time.monotonic()
+        await self._bucket.acquire(self._sleep)
+        self.stats["waited_s"] += time.monotonic() - t0
+        self.stats["requests"] += 1
+        return await self._client.get(
+            f"{BDL_BASE_URL}{path}",
+            params=params,
+            headers={"Authorization": BALL_DONT_LIE_API_KEY, **(headers or {})},
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform in [0, min(max, base * 2^(attempt-1))]."""
+        ceiling = min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+def page_cache_ttl(end_date: str | None, today: date) -> Callable[[dict], float]:
+    """
+    Cache lifetime policy for /games pages of the window ending on end_date.
+
+    A page of a window that ended before today where every game is Final can
+    no longer change and is cached forever. Other pages of a window that ended
+    more than a day ago are cached for BDL_CACHE_PAST_TTL_S. Everything else
+    (open-ended or current windows) uses BDL_CACHE_TTL_S.
+    """
+    end = date.fromisoformat(end_date) if end_date else None
+
+    def ttl(body: dict) -> float:
+        if end is None or end >= today:
+            return BDL_CACHE_TTL_S
+        games = body.get("data") or []
+        if games and all(g.get("status") == "Final" for g in games):
+            return math.inf
+        if end < today - timedelta(days=1):
+            return BDL_CACHE_PAST_TTL_S
+        return BDL_CACHE_TTL_S
+
+    return ttl
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+async def iter_bdl_game_pages(
+    client: BdlClient,
+    start_date: str = PLAYOFFS_START_DATE,
+    end_date: str | None = None,
+    today: date | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Yield each page of play-in + playoff games from BallDontLie as it arrives.
     Uses a start_date filter instead of postseason=true so that play-in games
     (which BallDontLie may not tag as postseason) are included.
-    Handles cursor-based pagination.
+    Pass start_date / end_date (inclusive, YYYY-MM-DD) to fetch only a window.
+    Handles cursor-based pagination. Pages are cached per window, see
+    page_cache_ttl.
     """
-    all_games: list[dict] = []
+    cache_ttl = page_cache_ttl(end_date, today or datetime.now(timezone.utc).date())
     cursor: int | None = None
 
     params: dict = {
         "seasons[]": BDL_SEASON,
         "per_page": 100,
-        "start_date": PLAYOFFS_START_DATE,
+        "start_date": start_date,
     }
+    if end_date is not None:
+        params["end_date"] = end_date
 
     while True:
         if cursor is not None:
             params["cursor"] = cursor
 
-        response = await client.get(
-            f"{BDL_BASE_URL}/games",
-            params=params,
-            headers={"Authorization": BALL_DONT_LIE_API_KEY},
-        )
-        response.raise_for_status()
-        body = response.json()
+        body = await client.get("/games", params=params, cache_ttl=cache_ttl)
 
         games = body.get("data", [])
-        all_games.extend(games)
+        if games:
+            yield games
 
         meta = body.get("meta", {})
         next_cursor = meta.get("next_cursor")
@@ -43,4 +291,109 @@ async def fetch_bdl_games(client: httpx.AsyncClient) -> list[dict]:
             break
         cursor = next_cursor
 
-    return all_games
+
+async def fetch_bdl_games(
+    client: BdlClient,
+    start_date: str = PLAYOFFS_START_DATE,
+    end_date: str | None = None,
+    today: date | None = None,
+) -> list[dict]:
+    """Fetch every game in the window with one serial cursor walk."""
+    return [
+        game
+        async for page in iter_bdl_game_pages(client, start_date, end_date, today=today)
+        for game in page
+    ]
+
+
+async def stream_bdl_games(
+    client: BdlClient,
+    windows: list[tuple[str, str | None]],
+    today: date | None = None,
+) -> AsyncIterator[list[dict]]:
+    """
+    Walk every (start, end) window's cursor concurrently on the shared client
+    and its rate limiter, yielding pages in arrival order. Games already
+    yielded from another window are dropped. When the consumer stops early
+    or a window fails, the remaining walks are cancelled.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    window_done = object()
+
+    async def walk(start: str, end: str | None) -> None:
+        try:
+            async for page in iter_bdl_game_pages(client, start, end, today=today):
+                queue.put_nowait(page)
+            queue.put_nowait(window_done)
+        except Exception as exc:
+            queue.put_nowait(exc)
+
+    tasks = [asyncio.create_task(walk(start, end)) for start, end in windows]
+    seen: set = set()
+    remaining = len(tasks)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is window_done:
+                remaining -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            page = [g for g in item if g["id"] not in seen]
+            seen.update(g["id"] for g in page)
+            if page:
+                yield page
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def date_partitions(
+    start_date: str,
+    end_date: str | None,
+    partition_days: int = 0,
+) -> list[tuple[str, str | None]]:
+    """
+    Split the inclusive range start_date..end_date (None = open-ended) into
+    contiguous (start, end) windows.
+
+    With partition_days > 0 the windows are fixed-size day buckets. Otherwise
+    they follow ROUND_DATE_RANGES, with any part of the range before the
+    play-in or after the finals as its own window. An open-ended range always
+    ends with an open-ended window, so games after the last known date are
+    still fetched.
+    """
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date) if end_date else None
+
+    if partition_days > 0:
+        last = end or max(start, date.fromisoformat(ROUND_DATE_RANGES[-1][2]))
+        bounds = []
+        cursor = start
+        while cursor <= last:
+            bounds.append((cursor, min(last, cursor + timedelta(days=partition_days - 1))))
+            cursor += timedelta(days=partition_days)
+    else:
+        bounds = []
+        cursor = start
+        for _round, round_start, round_end in ROUND_DATE_RANGES:
+            r_start, r_end = date.fromisoformat(round_start), date.fromisoformat(round_end)
+            if end is not None and r_start > end:
+                break
+            if r_end < cursor:
+                continue
+            if cursor < r_start:
+                bounds.append((cursor, r_start - timedelta(days=1)))
+                cursor = r_start
+            bounds.append((cursor, r_end if end is None else min(r_end, end)))
+            cursor = r_end + timedelta(days=1)
+        if end is not None and cursor <= end:
+            bounds.append((cursor, end))
+        elif end is None and not bounds:
+            bounds.append((cursor, cursor))
+
+    windows: list[tuple[str, str | None]] = [(s.isoformat(), e.isoformat()) for s, e in bounds]
+    if end is None:
+        # Leave the last window open so nothing after the known schedule is missed.
+        windows[-1] = (windows[-1][0], None)
+    return windows
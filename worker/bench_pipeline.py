@@ -0,0 +1,126 @@
+"""
+Run the full pipeline offline against the SQLite backend and report storage
+query counts and latency per run.
+
+Usage:
+    python bench_pipeline.py [users] [sqlite path]
+
+A synthetic bracket (8 first-round, 4 second-round, 2 conference and 1 finals
+matchups of 6 games each) is served by a mocked BallDontLie API. Three runs:
+
+  1. cold start — every event and every event × user bet row is created,
+  2. first round finished — users have placed bets, first-round games and
+     series resolve and are scored,
+  3. steady state — nothing changed.
+
+The database defaults to ":memory:"; pass a path to inspect it afterwards.
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# The benchmark must not touch the real sync state or response cache.
+os.environ.setdefault("SYNC_STATE_PATH", os.path.join(tempfile.mkdtemp(), "sync_state.json"))
+os.environ.setdefault("BDL_CACHE", "false")
+
+import httpx
+
+import sqlite_store
+from async_db import AsyncSupabase
+from bdl_client import BdlClient
+from config import ROUND_DATE_RANGES
+from sync import sync_all
+
+DEFAULT_USERS = 5000
+ROUND_MATCHUPS = {"firstRound": 8, "secondRound": 4, "conference": 2, "finals": 1}
+GAMES_PER_MATCHUP = 6
+
+
+def make_games(finished_rounds: set[str]) -> list[dict]:
+    """One BallDontLie game dict per game of the synthetic bracket."""
+    rng = random.Random(0)
+    games: list[dict] = []
+    starts = {name: date.fromisoformat(start) for name, start, _ in ROUND_DATE_RANGES}
+    for round_name, matchups in ROUND_MATCHUPS.items():
+        for m in range(matchups):
+            home, visitor = f"Home{round_name}{m}", f"Away{round_name}{m}"
+            for g in range(GAMES_PER_MATCHUP):
+                day = starts[round_name] + timedelta(days=2 * g)
+                final = round_name in finished_rounds
+                games.append({
+                    "id": len(games) + 1,
+                    "date": day.isoformat(),
+                    "datetime": f"{day.isoformat()}T23:00:00Z",
+                    "status": "Final" if final else "7:00 pm ET",
+                    "period": 4 if final else 0,
+                    "postseason": True,
+                    "home_team_score": rng.randint(95, 125) if final else 0,
+                    "visitor_team_score": rng.randint(95, 125) if final else 0,
+                    "home_team": {"id": 2 * m, "name": home, "full_name": home},
+                    "visitor_team": {"id": 2 * m + 1, "name": visitor, "full_name": visitor},
+                })
+    return games
+
+
+def bdl_client(games: list[dict]) -> BdlClient:
+    """A BdlClient whose /games endpoint serves games, filtered by date window."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        start = request.url.params.get("start_date", "")
+        end = request.url.params.get("end_date", "9999-12-31")
+        data = [g for g in games if start <= g["date"] <= end]
+        return httpx.Response(200, json={"data": data, "meta": {}})
+
+    async def no_sleep(_seconds: float) -> None:
+        pass
+
+    return BdlClient(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        requests_per_minute=1e6, burst=1000, sleep=no_sleep,
+    )
+
+
+def place_bets(client: sqlite_store.SqliteClient) -> None:
+    """Fill winnerTeam / winMargin on every bet, as users would."""
+    rng = random.Random(1)
+    rows = client.execute('select b."id", e."team1", e."team2" from bets b join events e on e."id" = b."eventId"')
+    client.executemany(
+        'update bets set "winnerTeam" = ?, "winMargin" = ? where "id" = ?',
+        ((rng.choice((row["team1"], row["team2"])), rng.randint(1, 15), row["id"]) for row in rows),
+    )
+
+
+async def run(label: str, db: AsyncSupabase, games: list[dict]) -> None:
+    sql = db.client
+    db.stats.clear()
+    sql.stats.update(queries=0, seconds=0.0)
+    sql.by_kind.clear()
+    t0 = time.monotonic()
+    async with bdl_client(games) as bdl:
+        summary = await sync_all(full_resync=True, db=db, bdl=bdl)
+    elapsed = time.monotonic() - t0
+    print(f"\n{label}: {elapsed:.2f}s · {summary['events_created'] + summary['series_created']} events "
+          f"created · {summary['bets_created']} bets created · {summary['bets_scored']} bets scored")
+    print(f"  SQL:     {sql.summary()}")
+    print(f"  storage: {db.summary()}")
+
+
+async def main(users: int, path: str) -> None:
+    client = sqlite_store.connect(path=path)
+    client.executemany('insert or ignore into users ("uuid") values (?)', ((f"user-{i}",) for i in range(users)))
+    db = AsyncSupabase(client, backend=sqlite_store)
+
+    await run("1. cold start", db, make_games(set()))
+    place_bets(client)
+    await run("2. first round finished", db, make_games({"firstRound"}))
+    await run("3. steady state", db, make_games({"firstRound"}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS,
+        sys.argv[2] if len(sys.argv) > 2 else ":memory:",
+    ))
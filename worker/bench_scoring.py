@@ -0,0 +1,68 @@
+"""
+Benchmark the pure-Python and NumPy scoring paths on synthetic events.
+
+Usage:
+    python bench_scoring.py [bet counts...]
+
+Use the crossover point to tune VECTOR_SCORING_MIN_BETS.
+"""
+import random
+import sys
+import timeit
+
+import scoring_numpy
+from models import _calc_series_points, _game_bet_points, _game_context
+from config import SCORING
+
+DEFAULT_SIZES = [100, 500, 1000, 2000, 5000, 20000, 100000]
+
+
+def make_bets(n: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": f"b{i}",
+            "winnerTeam": rng.choice(["Celtics", "Lakers", None]),
+            "winMargin": rng.choice([None, *range(1, 31)]),
+        }
+        for i in range(n)
+    ]
+
+
+def python_game(event: dict, bets: list[dict]) -> list[tuple[int, int]]:
+    rules = SCORING[event["round"]]
+    context = _game_context(event, bets)
+    return [_game_bet_points(b, context, rules) for b in bets]
+
+
+def python_series(event: dict, bets: list[dict]) -> list[tuple[int, int]]:
+    rules = SCORING[event["round"]]
+    return [_calc_series_points(b, event, rules) for b in bets]
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    number = 3
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main(sizes: list[int]) -> None:
+    if not scoring_numpy.AVAILABLE:
+        sys.exit("NumPy is not installed — nothing to compare.")
+
+    rng = random.Random(0)
+    game = {"team1": "Celtics", "team2": "Lakers", "team1Score": 112, "team2Score": 104,
+            "eventType": "game", "round": "finals"}
+    series = {"team1": "Celtics", "team2": "Lakers", "team1Score": 4, "team2Score": 2,
+              "eventType": "series", "round": "finals", "gameNumber": 6}
+
+    print(f"{'bets':>8}  {'type':<7} {'python ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for n in sizes:
+        bets = make_bets(n, rng)
+        for label, event, py_fn in (("game", game, python_game), ("series", series, python_series)):
+            assert py_fn(event, bets) == scoring_numpy.score_event_vectorized(event, bets)
+            py_s = best_of(lambda: py_fn(event, bets))
+            np_s = best_of(lambda: scoring_numpy.score_event_vectorized(event, bets))
+            print(f"{n:>8}  {label:<7} {py_s * 1e3:>10.2f} {np_s * 1e3:>10.2f} {py_s / np_s:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,51 @@
+"""
+Compact index of which users already have a bet row on which event.
+
+Step 5 only needs one question answered — "does (eventId, userId) have a bet
+yet?" — for every event × user. A Python set of string tuples costs a few
+hundred bytes per pair; here each user ID is interned once to a small integer
+and every event keeps a bitmap (an int) of the users that have a bet, so a
+season of pairs fits in a few kilobytes.
+"""
+from collections.abc import Iterable
+
+
+class BetPairIndex:
+    """Set-like container of (event_id, user_id) pairs backed by per-event bitmaps."""
+
+    __slots__ = ("_user_bits", "_event_bitmaps", "_count")
+
+    def __init__(self, pairs: Iterable[tuple[str, str]] = ()):
+        self._user_bits: dict[str, int] = {}
+        self._event_bitmaps: dict[str, int] = {}
+        self._count = 0
+        for event_id, user_id in pairs:
+            self.add(event_id, user_id)
+
+    def add(self, event_id: str, user_id: str) -> None:
+        user_key = str(user_id)
+        bit = self._user_bits.get(user_key)
+        if bit is None:
+            bit = self._user_bits[user_key] = len(self._user_bits)
+        bitmap = self._event_bitmaps.get(event_id, 0)
+        mask = 1 << bit
+        if not bitmap & mask:
+            self._event_bitmaps[event_id] = bitmap | mask
+            self._count += 1
+
+    def __contains__(self, pair: object) -> bool:
+        try:
+            event_id, user_id = pair
+        except (TypeError, ValueError):
+            return False
+        bit = self._user_bits.get(str(user_id))
+        if bit is None:
+            return False
+        return bool(self._event_bitmaps.get(event_id, 0) >> bit & 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def event_count(self) -> int:
+        """Number of events with at least one bet row."""
+        return len(self._event_bitmaps)
@@ -14,6 +14,22 @@ SUPABASE_URL = os.environ.get("SUPABASE_URL", os.environ.get("NEXT_PUBLIC_SUPABA
 SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", ""))
 EVENTS_ONLY = os.environ.get("EVENTS_ONLY", "false").lower() == "true"
 
+# Create bets with INSERT ... ON CONFLICT ("eventId", "userId") DO NOTHING instead
+# of pre-loading every existing bet pair. Requires a unique index on
+# bets ("eventId", "userId") — see README.
+BET_INSERT_ON_CONFLICT = os.environ.get("BET_INSERT_ON_CONFLICT", "false").lower() == "true"
+
+# Incremental sync: after a full run, only re-fetch BallDontLie games in a
+# rolling date window and merge them into the games cached in SYNC_STATE_PATH.
+# FULL_SYNC=true (or `python run.py --full`) forces a complete re-fetch.
+INCREMENTAL_SYNC = os.environ.get("INCREMENTAL_SYNC", "true").lower() == "true"
+FULL_SYNC = os.environ.get("FULL_SYNC", "false").lower() == "true"
+SYNC_STATE_PATH = Path(
+    os.environ.get("SYNC_STATE_PATH", Path(__file__).resolve().parent / ".sync_state.json")
+)
+SYNC_LOOKBACK_DAYS = int(os.environ.get("SYNC_LOOKBACK_DAYS", "2"))
+SYNC_LOOKAHEAD_DAYS = int(os.environ.get("SYNC_LOOKAHEAD_DAYS", "7"))
+
 # Comma-separated list of user IDs to restrict bet creation to.
 # When set, bets are only created for these users — useful for verifying
 # events and scoring before rolling out to all users.
@@ -25,6 +41,25 @@ TARGET_USER_IDS: list[str] | None = (
     else None
 )
 
+# Daemon mode (python run.py --daemon): seconds between ticks while a game is
+# live or about to start, and when nothing is. Polling speeds up
+# DAEMON_PREGAME_LEAD_S before the next tip-off. The Supabase state is kept in
+# memory between ticks and reloaded from Supabase every DAEMON_RELOAD_INTERVAL_S.
+DAEMON_LIVE_INTERVAL_S = float(os.environ.get("DAEMON_LIVE_INTERVAL_S", "60"))
+DAEMON_IDLE_INTERVAL_S = float(os.environ.get("DAEMON_IDLE_INTERVAL_S", "1800"))
+DAEMON_PREGAME_LEAD_S = float(os.environ.get("DAEMON_PREGAME_LEAD_S", "300"))
+DAEMON_RELOAD_INTERVAL_S = float(os.environ.get("DAEMON_RELOAD_INTERVAL_S", "3600"))
+# While games are live, the daemon refreshes their scores (live_scores.py)
+# every LIVE_SCORE_INTERVAL_S between full ticks. 0 disables live scores.
+LIVE_SCORE_INTERVAL_S = float(os.environ.get("LIVE_SCORE_INTERVAL_S", "15"))
+# Column the daemon's resident state store (state_store.py) uses to re-read
+# only the events changed since its last refresh: a timestamp or counter the
+# database bumps on every write. Without it, events are reloaded in full.
+STATE_CHANGE_COLUMN = os.environ.get("STATE_CHANGE_COLUMN", "updated_at")
+# The run planner (planner.py) expects a game to be Final this long after
+# tip-off and schedules a wake-up for it.
+EXPECTED_GAME_DURATION_S = float(os.environ.get("EXPECTED_GAME_DURATION_S", "9000"))
+
 # ---------------------------------------------------------------------------
 # Season configuration
 # ---------------------------------------------------------------------------
@@ -35,6 +70,76 @@ APP_SEASON = 2026          # App / Supabase season value
 
 BDL_BASE_URL = "https://api.balldontlie.io/v1"
 
+# ---------------------------------------------------------------------------
+# BallDontLie rate limiting
+# ---------------------------------------------------------------------------
+# Token bucket sized to the API tier (free: 5/min, ALL-STAR: 60/min,
+# GOAT: 600/min). BDL_BURST requests may go out back to back before the
+# bucket starts pacing them.
+BDL_REQUESTS_PER_MINUTE = float(os.environ.get("BDL_REQUESTS_PER_MINUTE", "60"))
+BDL_BURST = int(os.environ.get("BDL_BURST", "5"))
+# Retries per request on 429 / 5xx / network errors. Retry-After is honoured
+# when present; otherwise the delay is jittered exponential backoff. Either
+# wait is capped at BDL_BACKOFF_MAX_S.
+BDL_MAX_RETRIES = int(os.environ.get("BDL_MAX_RETRIES", "5"))
+BDL_BACKOFF_BASE_S = float(os.environ.get("BDL_BACKOFF_BASE_S", "1.0"))
+BDL_BACKOFF_MAX_S = float(os.environ.get("BDL_BACKOFF_MAX_S", "60"))
+# Maximum BDL requests (retries included) per sync run. 0 = unlimited.
+BDL_REQUEST_BUDGET = int(os.environ.get("BDL_REQUEST_BUDGET", "500"))
+
+# Step 1 splits the requested date range into independent windows and pages
+# through them concurrently (within the rate limit). Windows follow
+# ROUND_DATE_RANGES, or fixed BDL_PARTITION_DAYS-day buckets when > 0.
+BDL_PARALLEL_FETCH = os.environ.get("BDL_PARALLEL_FETCH", "true").lower() == "true"
+BDL_PARTITION_DAYS = int(os.environ.get("BDL_PARTITION_DAYS", "0"))
+
+# On-disk BDL response cache (bdl_cache.py). Pages of windows that include
+# today or later are revalidated after BDL_CACHE_TTL_S; windows that ended
+# before today after BDL_CACHE_PAST_TTL_S. Past pages where every game is
+# Final never expire.
+BDL_CACHE = os.environ.get("BDL_CACHE", "true").lower() == "true"
+BDL_CACHE_DIR = Path(
+    os.environ.get("BDL_CACHE_DIR", Path(__file__).resolve().parent / ".bdl_cache")
+)
+BDL_CACHE_TTL_S = float(os.environ.get("BDL_CACHE_TTL_S", "0"))
+BDL_CACHE_PAST_TTL_S = float(os.environ.get("BDL_CACHE_PAST_TTL_S", "21600"))
+
+# ---------------------------------------------------------------------------
+# Storage backend
+# ---------------------------------------------------------------------------
+# "supabase" (default) or "sqlite": a local stand-in with the same semantics
+# (sqlite_store.py) for offline runs and benchmarks. SQLITE_PATH is its
+# database file; ":memory:" gives a throwaway database.
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.environ.get("SQLITE_PATH", str(Path(__file__).resolve().parent / "local.db"))
+
+# ---------------------------------------------------------------------------
+# Supabase write tuning
+# ---------------------------------------------------------------------------
+# Bet scores are written in chunks of bet IDs (one UPDATE ... WHERE id IN (...)
+# per chunk). Keep chunks small enough that the ID list fits in the URL.
+BET_SCORE_CHUNK_SIZE = int(os.environ.get("BET_SCORE_CHUNK_SIZE", "200"))
+# Bet rows per insert request in Step 5, and how many of those requests may be
+# in flight at once. Rows are generated lazily, so at most
+# BET_INSERT_CHUNK_SIZE * BET_INSERT_CONCURRENCY rows are held in memory.
+BET_INSERT_CHUNK_SIZE = int(os.environ.get("BET_INSERT_CHUNK_SIZE", "500"))
+BET_INSERT_CONCURRENCY = int(os.environ.get("BET_INSERT_CONCURRENCY", "4"))
+# Event rows per bulk_update_events call when writing Step 3/4 event updates.
+EVENT_WRITE_CHUNK_SIZE = int(os.environ.get("EVENT_WRITE_CHUNK_SIZE", "500"))
+# Attempts per chunked write before the error is raised (1 = no retry).
+DB_WRITE_ATTEMPTS = int(os.environ.get("DB_WRITE_ATTEMPTS", "3"))
+# Supabase requests in flight at once. Also sizes the client's shared HTTP/2
+# keep-alive connection pool.
+SUPABASE_MAX_CONCURRENCY = int(os.environ.get("SUPABASE_MAX_CONCURRENCY", "8"))
+# Rows per page for paginated selects. Must not exceed the project's PostgREST
+# max-rows setting (1000 by default), otherwise pages look short and paging stops.
+SUPABASE_PAGE_SIZE = int(os.environ.get("SUPABASE_PAGE_SIZE", "1000"))
+# Events with at least this many bets are scored with the NumPy backend
+# (scoring_numpy.py) when NumPy is installed. See bench_scoring.py.
+VECTOR_SCORING_MIN_BETS = int(os.environ.get("VECTOR_SCORING_MIN_BETS", "2000"))
+# Resolved events fetched / scored / written at the same time in Step 6.
+SCORING_CONCURRENCY = int(os.environ.get("SCORING_CONCURRENCY", "4"))
+
 # ---------------------------------------------------------------------------
 # Round detection – configurable date ranges for the 2026 playoffs
 # ---------------------------------------------------------------------------
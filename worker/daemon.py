@@ -0,0 +1,146 @@
+"""
+Long-running sync loop (python run.py --daemon).
+
+Instead of a cold start per cron run, the daemon keeps one process alive and
+calls sync.sync_all on an adaptive schedule:
+
+  - every DAEMON_LIVE_INTERVAL_S while a game is in progress or within
+    DAEMON_PREGAME_LEAD_S of tip-off,
+  - otherwise it sleeps until shortly before the next tip-off or the
+    planner's next wake-up (expected finals, bet deadlines; see planner.py),
+    whichever comes first, at most DAEMON_IDLE_INTERVAL_S.
+
+Between ticks it keeps the pooled Supabase client, the BallDontLie client
+(connections, token bucket, response cache) and a StateStore (events, bet
+pairs, users; see state_store.py) in memory. Each tick only re-reads the
+events changed since the previous one. The store is reloaded in full every
+DAEMON_RELOAD_INTERVAL_S and after a failed tick.
+
+While games are live, their scores are refreshed every LIVE_SCORE_INTERVAL_S
+between full ticks (live_scores.py). When one of the games the last tick saw
+in progress goes Final, the next full tick runs right away so it is scored.
+
+SIGTERM / SIGINT stop the loop: a tick in progress is allowed to finish, then
+the clients are closed and the process exits.
+"""
+import asyncio
+import signal
+import sys
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from async_db import AsyncSupabase
+from bdl_cache import ResponseCache
+from bdl_client import BdlClient
+from config import (
+    BDL_CACHE, FULL_SYNC,
+    DAEMON_LIVE_INTERVAL_S, DAEMON_IDLE_INTERVAL_S, DAEMON_PREGAME_LEAD_S, DAEMON_RELOAD_INTERVAL_S,
+    LIVE_SCORE_INTERVAL_S,
+)
+from live_scores import refresh_live_scores
+from state_store import StateStore
+from sync import sync_all
+
+
+def next_interval(summary: dict, now: datetime) -> float:
+    """Seconds until the next tick, from a sync_all summary."""
+    if summary.get("games_live"):
+        return DAEMON_LIVE_INTERVAL_S
+    targets = []
+    if summary.get("next_start"):
+        targets.append((datetime.fromisoformat(summary["next_start"]) - now).total_seconds() - DAEMON_PREGAME_LEAD_S)
+    if summary.get("next_wake"):
+        targets.append((datetime.fromisoformat(summary["next_wake"]) - now).total_seconds())
+    if not targets:
+        return DAEMON_IDLE_INTERVAL_S
+    return min(DAEMON_IDLE_INTERVAL_S, max(DAEMON_LIVE_INTERVAL_S, min(targets)))
+
+
+def failure_interval(failures: int) -> float:
+    """Back off after consecutive failed ticks, from the live interval up to the idle one."""
+    return min(DAEMON_IDLE_INTERVAL_S, DAEMON_LIVE_INTERVAL_S * 2 ** (failures - 1))
+
+
+async def wait_for_next_tick(
+    stop: asyncio.Event,
+    interval: float,
+    live_game_ids: Iterable[str],
+    db: AsyncSupabase,
+    bdl: BdlClient,
+) -> None:
+    """
+    Sleep for interval seconds or until stop is set. While live_game_ids (the
+    games in progress at the last tick) is not empty, refresh live scores every
+    LIVE_SCORE_INTERVAL_S meanwhile, and return early once one of them is Final
+    and needs the full tick. Live games outside the refresh's date window never
+    show up as Final there and simply wait for the next tick.
+    """
+    live_game_ids = set(live_game_ids)
+    deadline = time.monotonic() + interval
+    while not stop.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        step = remaining
+        if live_game_ids and 0 < LIVE_SCORE_INTERVAL_S < remaining:
+            step = LIVE_SCORE_INTERVAL_S
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=step)
+            return
+        except asyncio.TimeoutError:
+            pass
+        if step == remaining:
+            return
+        try:
+            result = await refresh_live_scores(db, bdl)
+        except Exception as exc:
+            print(f"Error: live score refresh failed: {exc}", file=sys.stderr, flush=True)
+            continue
+        print(f"  live: {result['live_games']} games · {result['scores_updated']} scores updated"
+              f" · {result['elapsed_s']:.2f}s", flush=True)
+        if live_game_ids.intersection(result["finished_game_ids"]):
+            return
+
+
+async def run_daemon(stop: asyncio.Event | None = None, full_resync: bool = FULL_SYNC) -> None:
+    """
+    Run sync ticks until stop is set (by SIGTERM / SIGINT unless given).
+    full_resync applies to the first tick only; later ticks are incremental.
+    """
+    if stop is None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+    db = AsyncSupabase()
+    bdl = BdlClient(cache=ResponseCache() if BDL_CACHE else None)
+    state = StateStore()
+    loaded_at = time.monotonic()
+    failures = 0
+
+    try:
+        while not stop.is_set():
+            if time.monotonic() - loaded_at >= DAEMON_RELOAD_INTERVAL_S:
+                state.invalidate()
+                loaded_at = time.monotonic()
+
+            live_game_ids: list[str] = []
+            try:
+                summary = await sync_all(full_resync, db=db, bdl=bdl, state=state)
+                full_resync = False
+                failures = 0
+                live_game_ids = summary.get("live_game_ids", [])
+                interval = next_interval(summary, datetime.now(timezone.utc))
+            except Exception as exc:
+                failures += 1
+                state.invalidate()  # partially applied writes: reload before the next tick
+                interval = failure_interval(failures)
+                print(f"Error: {exc}", file=sys.stderr, flush=True)
+
+            print(f"  next tick in {interval:.0f}s", flush=True)
+            await wait_for_next_tick(stop, interval, live_game_ids, db, bdl)
+    finally:
+        await bdl.aclose()
+        await db.aclose()
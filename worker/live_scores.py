@@ -0,0 +1,68 @@
+"""
+Live score refresh for games in progress.
+
+A lightweight pass between full pipeline runs: fetch only today's games from
+BallDontLie (yesterday's too, for late games running past midnight ET), keep
+the ones in progress, and write team1Score / team2Score for the events whose
+stored score differs, in one bulk_update_events call. Status changes, new events and
+scoring are left to sync.sync_all.
+
+The events table has no period column, so the period is reported in the
+summary but not stored.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+from async_db import AsyncSupabase
+from bdl_client import BdlClient, fetch_bdl_games
+from config import STATUS_IN_PROGRESS
+from models import EASTERN, Game, diff_event_update
+
+
+async def refresh_live_scores(db: AsyncSupabase, bdl: BdlClient, now: datetime | None = None) -> dict:
+    """
+    Push score changes of in-progress games. Returns
+        {"live_games", "finished_game_ids", "scores_updated", "failures", "periods", "elapsed_s"}
+    where finished_game_ids are the BallDontLie ids of the fetched games that
+    are Final and periods maps event id -> current period of each live game.
+    """
+    t0 = time.monotonic()
+    today = (now or datetime.now(timezone.utc)).astimezone(EASTERN).date()
+    raw_games = await fetch_bdl_games(
+        bdl, (today - timedelta(days=1)).isoformat(), today.isoformat(), today=today
+    )
+    games = [Game.from_bdl(g) for g in raw_games]
+    finished_game_ids = [str(g.id) for g in games if g.final]
+    live = [g for g in games if g.period > 0 and not g.final]
+    if not live:
+        return {"live_games": 0, "finished_game_ids": finished_game_ids, "scores_updated": 0,
+                "failures": [], "periods": {}, "elapsed_s": time.monotonic() - t0}
+
+    stored_by_parent = {
+        str(e["parentEvent"]): e
+        for e in await db.fetch_events_by_parent([str(g.id) for g in live])
+    }
+    updates: list[tuple[dict, dict]] = []
+    periods: dict[str, int] = {}
+    for game in live:
+        stored = stored_by_parent.get(str(game.id))
+        # Only rows the pipeline already moved to in progress; new events and
+        # status transitions belong to the full run.
+        if stored is None or stored.get("status") != STATUS_IN_PROGRESS:
+            continue
+        periods[stored["id"]] = game.period
+        changes = diff_event_update(
+            stored, {"team1Score": game.home_score, "team2Score": game.visitor_score}
+        )
+        if changes:
+            updates.append((stored, changes))
+
+    written, failures = await db.update_events(updates) if updates else (0, [])
+    return {
+        "live_games": len(live),
+        "finished_game_ids": finished_game_ids,
+        "scores_updated": written,
+        "failures": failures,
+        "periods": periods,
+        "elapsed_s": time.monotonic() - t0,
+    }
@@ -1,5 +1,10 @@
-from datetime import date, timezone, timedelta
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import date, datetime, timezone, timedelta
 from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 
 # EDT (UTC-4) is in effect for the entire playoff window (April–June).
 EASTERN = timezone(timedelta(hours=-4))
@@ -13,44 +18,77 @@ from config import (
     STATUS_UPCOMING,
     STATUS_IN_PROGRESS,
     STATUS_RESOLVED,
+    VECTOR_SCORING_MIN_BETS,
 )
+import scoring_numpy
 
 
 # ---------------------------------------------------------------------------
 # Round detection
 # ---------------------------------------------------------------------------
 
+class _RoundIndex:
+    """
+    ROUND_DATE_RANGES compiled once: boundary dates parsed up front and the
+    range starts kept sorted for a bisect lookup.
+    """
+
+    __slots__ = ("starts", "ends", "names", "first_start", "last_end")
+
+    def __init__(self, ranges: list[tuple[str, str, str]]):
+        compiled = sorted(
+            (date.fromisoformat(start), date.fromisoformat(end), name)
+            for name, start, end in ranges
+        )
+        self.starts = [start for start, _, _ in compiled]
+        self.ends = [end for _, end, _ in compiled]
+        self.names = [name for _, _, name in compiled]
+        self.first_start = date.fromisoformat(ranges[0][1])
+        self.last_end = date.fromisoformat(ranges[-1][2])
+
+    def lookup(self, game_date: date) -> str:
+        i = bisect_right(self.starts, game_date) - 1
+        if i >= 0 and game_date <= self.ends[i]:
+            return self.names[i]
+        # If the date is before the play-in, default to playin;
+        # if after finals, default to finals; otherwise firstRound.
+        if game_date < self.first_start:
+            return "playin"
+        if game_date > self.last_end:
+            return "finals"
+        return "firstRound"
+
+
+_ROUND_INDEX = _RoundIndex(ROUND_DATE_RANGES)
+
+
+def _parse_game_datetime(value: str) -> datetime:
+    """Parse a BDL timestamp: datetime.fromisoformat for ISO-8601, dateutil otherwise."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return parse_date(value)
+
+
+@lru_cache(maxsize=4096)
 def detect_round(game_date_str: str) -> str:
     """
     Determine the playoff round based on the game date.
     Falls back to 'firstRound' if the date doesn't match any configured range.
+    Results are memoised per timestamp string.
     """
     try:
-        dt = parse_date(game_date_str)
+        dt = _parse_game_datetime(game_date_str)
         # BDL datetimes are UTC. Convert to Eastern Time before extracting the
         # date so that late-night play-in games (e.g. 10pm ET = 02:00 UTC next
         # day) are not mis-classified as the following round.
         if dt.tzinfo is not None:
             dt = dt.astimezone(EASTERN)
         game_date = dt.date()
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, OverflowError):
         return "firstRound"
 
-    for round_name, start_str, end_str in ROUND_DATE_RANGES:
-        start = date.fromisoformat(start_str)
-        end = date.fromisoformat(end_str)
-        if start <= game_date <= end:
-            return round_name
-
-    # If the date is before the play-in, default to playin;
-    # if after finals, default to finals; otherwise firstRound.
-    playin_start = date.fromisoformat(ROUND_DATE_RANGES[0][1])
-    finals_end = date.fromisoformat(ROUND_DATE_RANGES[-1][2])
-    if game_date < playin_start:
-        return "playin"
-    if game_date > finals_end:
-        return "finals"
-    return "firstRound"
+    return _ROUND_INDEX.lookup(game_date)
 
 
 def detect_event_type(round_name: str) -> str:
@@ -60,13 +98,86 @@ def detect_event_type(round_name: str) -> str:
     return "game"
 
 
+# ---------------------------------------------------------------------------
+# Game records
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True, frozen=True)
+class Game:
+    """
+    A BallDontLie game, parsed once at ingestion.
+
+    Team names, scores and status are lifted out of the nested BDL JSON, and
+    the start timestamp is parsed once into dated_round (the round its own
+    Eastern date falls in). start keeps the raw timestamp, which is what
+    event rows store and games are ordered by.
+    """
+
+    id: int
+    start: str
+    date: str
+    home: str
+    visitor: str
+    status: str
+    period: int
+    home_score: int
+    visitor_score: int
+    dated_round: str
+
+    @classmethod
+    def from_bdl(cls, raw: dict) -> "Game":
+        start = raw.get("datetime") or raw.get("date", "")
+        return cls(
+            id=raw["id"],
+            start=start,
+            date=raw.get("date") or "",
+            home=raw["home_team"]["name"],
+            visitor=raw["visitor_team"]["name"],
+            status=raw.get("status", "") or "",
+            period=raw.get("period", 0) or 0,
+            home_score=raw.get("home_team_score", 0) or 0,
+            visitor_score=raw.get("visitor_team_score", 0) or 0,
+            dated_round=detect_round(start),
+        )
+
+    @property
+    def final(self) -> bool:
+        return self.status == "Final"
+
+    @property
+    def winner(self) -> str:
+        return self.home if self.home_score > self.visitor_score else self.visitor
+
+    @property
+    def matchup_key(self) -> tuple[str, str]:
+        """Sorted team names, so home/away is normalised."""
+        return (self.home, self.visitor) if self.home <= self.visitor else (self.visitor, self.home)
+
+
+def parse_start_time(start: str) -> datetime | None:
+    """Tip-off instant of a BDL start timestamp; None for date-only (time TBD) or invalid values."""
+    if len(start) <= 10:
+        return None
+    try:
+        dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def as_game(game: dict | Game) -> Game:
+    """Accept a raw BDL dict or an already parsed Game."""
+    return game if isinstance(game, Game) else Game.from_bdl(game)
+
+
 # ---------------------------------------------------------------------------
 # Game-number derivation
 # ---------------------------------------------------------------------------
 
-def _majority_round(matchup_games: list[dict]) -> str:
+def _majority_vote(rounds: list[str]) -> str | None:
     """
-    Pick the playoff round for a matchup via majority vote across all games.
+    Pick the playoff round for a matchup via majority vote across its games'
+    dated rounds (ties go to the round seen first; None if empty).
 
     BDL sometimes uses placeholder datetimes (midnight or 1:30am UTC) for
     not-yet-scheduled games.  These cross the ET date boundary and can cause
@@ -75,13 +186,89 @@ def _majority_round(matchup_games: list[dict]) -> str:
     the correct round detected from confirmed game times.
     """
     votes: dict[str, int] = defaultdict(int)
-    for g in matchup_games:
-        dt_str = g.get("datetime") or g.get("date", "")
-        votes[detect_round(dt_str)] += 1
-    return max(votes, key=lambda r: votes[r])
+    for r in rounds:
+        votes[r] += 1
+    return max(votes, key=lambda r: votes[r]) if votes else None
 
 
-def compute_game_numbers(games: list[dict]) -> tuple[dict[int, int], dict[int, str]]:
+class Matchup:
+    """
+    All games between one pair of teams, sorted by start time, with the
+    derived values the event builders need.
+
+    games / round cover every game of the matchup (game numbering). The
+    series_* fields cover only the games not dated in the play-in window,
+    since play-in games are never part of a series even when the same two
+    teams meet again later.
+    """
+
+    __slots__ = (
+        "key", "games", "round",
+        "series_games", "series_round", "team1", "team2", "team1_wins", "team2_wins", "start_time",
+    )
+
+    def __init__(self, key: tuple[str, str], games: list[Game]):
+        self.key = key
+        self.games = games
+        self.round = _majority_vote([g.dated_round for g in games])
+
+        self.series_games = [g for g in games if g.dated_round != "playin"]
+        self.series_round = _majority_vote([g.dated_round for g in self.series_games])
+        self.team1 = self.team2 = self.start_time = None
+        self.team1_wins = self.team2_wins = 0
+        if not self.series_games:
+            return
+
+        # Use the first game to determine consistent team1/team2 ordering
+        first_game = self.series_games[0]
+        self.team1 = first_game.home
+        self.team2 = first_game.visitor
+        self.start_time = first_game.start
+        for g in self.series_games:
+            if g.final:
+                if g.winner == self.team1:
+                    self.team1_wins += 1
+                else:
+                    self.team2_wins += 1
+
+
+class MatchupIndex:
+    """
+    BDL games grouped once per run by matchup (sorted team names, so home/away
+    is normalised), shared by compute_game_numbers, build_series_events and
+    build_special_events. Accepts raw BDL dicts or Game records.
+
+      matchups      : matchup key -> Matchup
+      game_numbers  : game_id -> game number (1-indexed within the matchup)
+      game_rounds   : game_id -> round of the matchup (majority vote)
+      round_starts  : round -> earliest start time among games dated in it
+    """
+
+    __slots__ = ("matchups", "game_numbers", "game_rounds", "round_starts")
+
+    def __init__(self, games: Iterable[dict | Game]):
+        grouped: dict[tuple[str, str], list[Game]] = defaultdict(list)
+        for game in map(as_game, games):
+            grouped[game.matchup_key].append(game)
+
+        self.matchups: dict[tuple[str, str], Matchup] = {}
+        self.game_numbers: dict[int, int] = {}
+        self.game_rounds: dict[int, str] = {}
+        self.round_starts: dict[str, str] = {}
+        for key, matchup_games in grouped.items():
+            # Sort by start time so game 1 is earliest
+            matchup_games.sort(key=attrgetter("start"))
+            matchup = Matchup(key, matchup_games)
+            self.matchups[key] = matchup
+            for idx, game in enumerate(matchup_games, start=1):
+                self.game_numbers[game.id] = idx
+                self.game_rounds[game.id] = matchup.round
+                known = self.round_starts.get(game.dated_round)
+                if known is None or game.start < known:
+                    self.round_starts[game.dated_round] = game.start
+
+
+def compute_game_numbers(games: Iterable[dict | Game]) -> tuple[dict[int, int], dict[int, str]]:
     """
     For each game, compute its game number within the series (matchup) and
     its playoff round.  Returns two mappings keyed by BDL game_id:
@@ -92,45 +279,29 @@ def compute_game_numbers(games: list[dict]) -> tuple[dict[int, int], dict[int, s
     This handles both calendar overlap (a first-round Game 7 on May 6 while
     second-round games have started) and BDL placeholder times (midnight UTC
     for unscheduled games that cross the ET date boundary).
+
+    sync_all reads the same maps from its per-run MatchupIndex.
     """
-    # Group games by matchup (sorted team names to normalise home/away)
-    matchups: dict[tuple[str, str], list[dict]] = defaultdict(list)
-    for game in games:
-        team_a = game["home_team"]["name"]
-        team_b = game["visitor_team"]["name"]
-        key = tuple(sorted([team_a, team_b]))
-        matchups[key].append(game)
-
-    game_number_map: dict[int, int] = {}
-    game_round_map: dict[int, str] = {}
-    for _key, matchup_games in matchups.items():
-        # Sort by datetime so game 1 is earliest
-        matchup_games.sort(key=lambda g: g.get("datetime") or g.get("date", ""))
-        round_name = _majority_round(matchup_games)
-        for idx, game in enumerate(matchup_games, start=1):
-            game_number_map[game["id"]] = idx
-            game_round_map[game["id"]] = round_name
-
-    return game_number_map, game_round_map
+    index = MatchupIndex(games)
+    return index.game_numbers, index.game_rounds
 
 
 # ---------------------------------------------------------------------------
 # Map BDL game -> Supabase event row
 # ---------------------------------------------------------------------------
 
-def map_game_to_event(game: dict, game_number: int, round_name: str) -> dict:
-    """Convert a BallDontLie game object to a Supabase event row.
+def map_game_to_event(game: dict | Game, game_number: int, round_name: str) -> dict:
+    """Convert a BallDontLie game (raw dict or Game) to a Supabase event row.
 
     round_name must come from compute_game_numbers so that all games in a
     matchup share the round of the matchup's first game, rather than being
     classified individually by date (which breaks when rounds overlap).
     """
-    bdl_status = game.get("status", "")
-    period = game.get("period", 0)
+    game = as_game(game)
 
-    if bdl_status == "Final":
+    if game.final:
         status = STATUS_RESOLVED
-    elif period > 0:
+    elif game.period > 0:
         status = STATUS_IN_PROGRESS
     else:
         status = STATUS_UPCOMING
@@ -138,13 +309,13 @@ def map_game_to_event(game: dict, game_number: int, round_name: str) -> dict:
     event_type = detect_event_type(round_name)
 
     return {
-        "id": str(game["id"]),
-        "team1": game["home_team"]["name"],
-        "team2": game["visitor_team"]["name"],
-        "team1Score": game.get("home_team_score", 0) or 0,
-        "team2Score": game.get("visitor_team_score", 0) or 0,
-        "startTime": game.get("datetime") or game.get("date", ""),
-        "parentEvent": str(game["id"]),
+        "id": str(game.id),
+        "team1": game.home,
+        "team2": game.visitor,
+        "team1Score": game.home_score,
+        "team2Score": game.visitor_score,
+        "startTime": game.start,
+        "parentEvent": str(game.id),
         "status": status,
         "eventType": event_type,
         "round": round_name,
@@ -153,65 +324,62 @@ def map_game_to_event(game: dict, game_number: int, round_name: str) -> dict:
     }
 
 
+def game_event_update(game: Game, existing: dict) -> dict:
+    """
+    Status / score update for a game that already has an event row; {} if none applies.
+
+    A finished game resolves the event with its final score, a started game
+    moves an upcoming event to in progress, and an in-progress event follows
+    the live score. diff_event_update drops values that did not change.
+    """
+    db_status = existing.get("status", STATUS_UPCOMING)
+    scores = {"team1Score": game.home_score, "team2Score": game.visitor_score}
+
+    if game.final and db_status != STATUS_RESOLVED:
+        return {"status": STATUS_RESOLVED, **scores}
+    if game.period > 0 and not game.final:
+        if db_status == STATUS_UPCOMING:
+            return {"status": STATUS_IN_PROGRESS, **scores}
+        if db_status == STATUS_IN_PROGRESS:
+            return scores
+    return {}
+
+
 # ---------------------------------------------------------------------------
 # Series-level event logic
 # ---------------------------------------------------------------------------
 
 def build_series_events(
-    games: list[dict],
+    games: Iterable[dict | Game],
     existing_events_by_parse: dict[str, dict],
+    matchups: MatchupIndex | None = None,
 ) -> tuple[list[dict], list[tuple[str, dict]]]:
     """
     Build series-level events from the individual games.
 
+    Pass the run's MatchupIndex as matchups to reuse its grouping; otherwise
+    one is built from games.
+
     Returns:
         new_series  -- list of new series event dicts to insert
         updates     -- list of (event_id, update_dict) for existing series to update
     """
-    # Group games by matchup
-    matchups: dict[tuple[str, str], list[dict]] = defaultdict(list)
-    for game in games:
-        team_a = game["home_team"]["name"]
-        team_b = game["visitor_team"]["name"]
-        key = tuple(sorted([team_a, team_b]))
-        matchups[key].append(game)
+    if matchups is None:
+        matchups = MatchupIndex(games)
 
     new_series: list[dict] = []
     updates: list[tuple[str, dict]] = []
 
-    for (team_a_sorted, team_b_sorted), matchup_games in matchups.items():
-        matchup_games.sort(key=lambda g: g.get("datetime") or g.get("date", ""))
-
-        # Use the first game to determine consistent team1/team2 ordering
-        first_game = matchup_games[0]
-        team1 = first_game["home_team"]["name"]
-        team2 = first_game["visitor_team"]["name"]
-
-        # Count wins
-        team1_wins = 0
-        team2_wins = 0
-        for g in matchup_games:
-            if g.get("status") == "Final":
-                home_score = g.get("home_team_score", 0) or 0
-                visitor_score = g.get("visitor_team_score", 0) or 0
-                home_name = g["home_team"]["name"]
-                if home_score > visitor_score:
-                    winner = home_name
-                else:
-                    winner = g["visitor_team"]["name"]
-                if winner == team1:
-                    team1_wins += 1
-                else:
-                    team2_wins += 1
-
-        total_games = team1_wins + team2_wins
-        earliest_datetime = matchup_games[0].get("datetime") or matchup_games[0].get("date", "")
-        round_name = _majority_round(matchup_games)
-
+    for (team_a_sorted, team_b_sorted), matchup in matchups.matchups.items():
         # Play-in games are individual events, not series — skip series creation.
-        if round_name == "playin":
+        if not matchup.series_games or matchup.series_round == "playin":
             continue
 
+        team1_wins = matchup.team1_wins
+        team2_wins = matchup.team2_wins
+        total_games = team1_wins + team2_wins
+        earliest_datetime = matchup.start_time
+
         # Determine series status
         wins_to_clinch = 4
         if team1_wins >= wins_to_clinch or team2_wins >= wins_to_clinch:
@@ -239,15 +407,15 @@ def build_series_events(
             # Create new series event
             new_series.append({
                 "id": series_parse_key,
-                "team1": team1,
-                "team2": team2,
+                "team1": matchup.team1,
+                "team2": matchup.team2,
                 "team1Score": team1_wins,
                 "team2Score": team2_wins,
                 "startTime": earliest_datetime,
                 "parentEvent": series_parse_key,
                 "status": series_status,
                 "eventType": "series",
-                "round": round_name,
+                "round": matchup.series_round,
                 "gameNumber": total_games,
                 "season": APP_SEASON,
             })
@@ -255,6 +423,36 @@ def build_series_events(
     return new_series, updates
 
 
+# ---------------------------------------------------------------------------
+# Change detection
+# ---------------------------------------------------------------------------
+
+def diff_event_update(existing: dict, update: dict) -> dict:
+    """
+    Return the subset of update whose values differ from the stored event row.
+
+    An empty result means the write would be a no-op. startTime is compared as
+    an instant, since Supabase returns timestamps in a different format from
+    BallDontLie ("+00:00" vs ".000Z").
+    """
+    return {
+        key: value
+        for key, value in update.items()
+        if not _same_event_value(key, existing.get(key), value)
+    }
+
+
+def _same_event_value(key: str, stored, value) -> bool:
+    if stored == value:
+        return True
+    if key == "startTime" and stored and value:
+        try:
+            return parse_date(stored) == parse_date(value)
+        except (ValueError, TypeError, OverflowError):
+            return False
+    return False
+
+
 # ---------------------------------------------------------------------------
 # Bet point calculation
 # ---------------------------------------------------------------------------
@@ -270,6 +468,8 @@ def calculate_points(
     event must be fully resolved (status == STATUS_RESOLVED) with final scores.
     all_event_bets is the full list of every user's bet on this event — needed
     to determine who was 'closest' on the margin guess.
+
+    Scoring a whole event this way is O(n²); use score_event for that.
     """
     event_type = event.get("eventType", "")
     round_name = event.get("round", "")
@@ -282,35 +482,78 @@ def calculate_points(
     return 0, 0
 
 
+def score_event(event: dict, bets: list[dict]) -> list[tuple[int, int]]:
+    """
+    Calculate (pointsGained, pointsGainedWinMargin) for every bet on one event.
+
+    Returns one tuple per bet, in the same order as bets. The actual winner,
+    margin and closest correct-winner delta are computed once, so scoring is a
+    single linear pass over the bets. Results match calculate_points(bet,
+    event, bets) for each bet.
+
+    Events with at least VECTOR_SCORING_MIN_BETS bets are scored with the
+    NumPy backend when it is available.
+    """
+    if len(bets) >= VECTOR_SCORING_MIN_BETS and scoring_numpy.AVAILABLE:
+        return scoring_numpy.score_event_vectorized(event, bets)
+
+    event_type = event.get("eventType", "")
+    rules = SCORING.get(event.get("round", ""), {})
+
+    if event_type in ("game", "playin"):
+        context = _game_context(event, bets)
+        return [_game_bet_points(bet, context, rules) for bet in bets]
+    if event_type == "series":
+        return [_calc_series_points(bet, event, rules) for bet in bets]
+    return [(0, 0)] * len(bets)
+
+
+def _game_context(event: dict, all_event_bets: list[dict]) -> tuple[str, int, int | None]:
+    """
+    Return (actual_winner, actual_diff, min_delta) for a resolved game.
+
+    min_delta is the smallest |winMargin - actual_diff| among bets that picked
+    the correct winner and entered a margin, or None if there are none.
+    """
+    actual_winner = (
+        event["team1"] if event["team1Score"] > event["team2Score"] else event["team2"]
+    )
+    actual_diff = abs(event["team1Score"] - event["team2Score"])
+
+    # Margin points: only users who picked the correct winner are eligible.
+    min_delta = min(
+        (
+            abs(int(b["winMargin"] or 0) - actual_diff)
+            for b in all_event_bets
+            if b.get("winnerTeam") == actual_winner and b.get("winMargin") is not None
+        ),
+        default=None,
+    )
+    return actual_winner, actual_diff, min_delta
+
+
 def _calc_game_points(
     bet: dict,
     event: dict,
     all_event_bets: list[dict],
     rules: dict[str, int],
 ) -> tuple[int, int]:
-    actual_winner = (
-        event["team1"] if event["team1Score"] > event["team2Score"] else event["team2"]
-    )
-    actual_diff = abs(event["team1Score"] - event["team2Score"])
-    correct_winner = bet.get("winnerTeam") == actual_winner
+    return _game_bet_points(bet, _game_context(event, all_event_bets), rules)
 
-    points_gained = rules.get("correctWinnerPoints", 0) if correct_winner else 0
 
-    if not correct_winner:
-        return points_gained, 0
+def _game_bet_points(
+    bet: dict,
+    context: tuple[str, int, int | None],
+    rules: dict[str, int],
+) -> tuple[int, int]:
+    actual_winner, actual_diff, min_delta = context
+    correct_winner = bet.get("winnerTeam") == actual_winner
 
-    # Margin points: only users who picked the correct winner are eligible.
-    # Collect the absolute delta between each correct-winner bet and the actual diff.
-    correct_winner_deltas = [
-        abs(int(b["winMargin"] or 0) - actual_diff)
-        for b in all_event_bets
-        if b.get("winnerTeam") == actual_winner and b.get("winMargin") is not None
-    ]
+    points_gained = rules.get("correctWinnerPoints", 0) if correct_winner else 0
 
-    if not correct_winner_deltas:
+    if not correct_winner or min_delta is None:
         return points_gained, 0
 
-    min_delta = min(correct_winner_deltas)
     bet_delta = abs(int(bet.get("winMargin") or 0) - actual_diff)
 
     if bet_delta == 0:
@@ -325,8 +568,9 @@ def _calc_game_points(
 
 
 def build_special_events(
-    bdl_games: list[dict],
+    bdl_games: Iterable[dict | Game],
     existing_events_by_parse: dict[str, dict],
+    matchups: MatchupIndex | None = None,
 ) -> tuple[list[dict], list[tuple[str, dict]]]:
     """
     Build finalsChampion and finalsMvp event rows.
@@ -339,18 +583,17 @@ def build_special_events(
       startTime = earliest Finals game time (betting deadline).
 
     Returns (new_events, updates) in the same shape as build_series_events.
+    Pass the run's MatchupIndex as matchups to reuse its per-round start times.
     """
+    if matchups is None:
+        matchups = MatchupIndex(bdl_games)
     new_events: list[dict] = []
     updates: list[tuple[str, dict]] = []
 
     # -- finalsChampion --
-    firstround_games = sorted(
-        [g for g in bdl_games
-         if detect_round(g.get("datetime") or g.get("date", "")) == "firstRound"],
-        key=lambda g: g.get("datetime") or g.get("date", ""),
-    )
-    if firstround_games and "finalsChampion" not in existing_events_by_parse:
-        deadline = firstround_games[0].get("datetime") or firstround_games[0].get("date", "")
+    firstround_start = matchups.round_starts.get("firstRound")
+    if firstround_start is not None and "finalsChampion" not in existing_events_by_parse:
+        deadline = firstround_start
         new_events.append({
             "id": "finalsChampion",
             "parentEvent": "finalsChampion",
@@ -373,14 +616,10 @@ def build_special_events(
         and e.get("eventType") == "series"
         and e.get("status") == STATUS_RESOLVED
     ]
-    finals_games = sorted(
-        [g for g in bdl_games
-         if detect_round(g.get("datetime") or g.get("date", "")) == "finals"],
-        key=lambda g: g.get("datetime") or g.get("date", ""),
-    )
+    finals_start = matchups.round_starts.get("finals")
     if (
         len(conference_resolved) >= 2
-        and finals_games
+        and finals_start is not None
         and "finalsMvp" not in existing_events_by_parse
     ):
         def _winner(s: dict) -> str:
@@ -388,7 +627,7 @@ def build_special_events(
 
         t1 = _winner(conference_resolved[0])
         t2 = _winner(conference_resolved[1])
-        deadline = finals_games[0].get("datetime") or finals_games[0].get("date", "")
+        deadline = finals_start
         new_events.append({
             "id": "finalsMvp",
             "parentEvent": "finalsMvp",
@@ -0,0 +1,88 @@
+"""
+Schedule planner: when is the next sync worth running?
+
+Reads startTime / status of the current-season events and lists the instants
+at which a run has work to do:
+
+  - tip_off         a game event starts (its bets close, it goes in progress)
+  - expected_final  a game is expected to be Final, EXPECTED_GAME_DURATION_S
+                    after tip-off (overdue in-progress games are due now)
+  - bet_close       a series / special event's betting deadline (bets close at
+                    the event's startTime, see sync._missing_bet_rows)
+
+The plan is plain JSON (python run.py --plan) so it can drive the daemon or an
+external dispatcher:
+
+    {"generated_at": "...", "next_wake": "...",
+     "wakes": [{"at": "...", "reasons": ["tip_off", "bet_close"], "event_ids": [...]}]}
+
+Wakes are sorted by time; events sharing an instant are merged into one wake.
+"""
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+from async_db import AsyncSupabase
+from config import EXPECTED_GAME_DURATION_S, STATUS_IN_PROGRESS, STATUS_UPCOMING
+from models import parse_start_time
+
+GAME_EVENT_TYPES = ("game", "playin")
+
+
+def plan_wakeups(events: Iterable[dict], now: datetime) -> dict:
+    """Build the wake-up plan for events (event rows with startTime, status, eventType)."""
+    duration = timedelta(seconds=EXPECTED_GAME_DURATION_S)
+    wakes: dict[datetime, dict] = {}
+
+    def _add(at: datetime, reason: str, event_id: str) -> None:
+        wake = wakes.setdefault(at, {"reasons": [], "event_ids": []})
+        if reason not in wake["reasons"]:
+            wake["reasons"].append(reason)
+        if event_id not in wake["event_ids"]:
+            wake["event_ids"].append(event_id)
+
+    for ev in events:
+        status = ev.get("status")
+        if status not in (STATUS_UPCOMING, STATUS_IN_PROGRESS):
+            continue
+        start_at = parse_start_time(ev.get("startTime") or "")
+        if start_at is None:
+            continue  # time TBD
+        event_id = str(ev.get("id"))
+        if ev.get("eventType") in GAME_EVENT_TYPES:
+            if status == STATUS_IN_PROGRESS:
+                _add(max(start_at + duration, now), "expected_final", event_id)
+                continue
+            # An upcoming game long past its tip-off (postponed, stale row) has
+            # nothing to wake for.
+            if start_at > now:
+                _add(start_at, "tip_off", event_id)
+            if start_at + duration > now:
+                _add(start_at + duration, "expected_final", event_id)
+        elif status == STATUS_UPCOMING and start_at > now:
+            _add(start_at, "bet_close", event_id)
+
+    ordered = [
+        {"at": at.isoformat(), "reasons": wake["reasons"], "event_ids": sorted(wake["event_ids"])}
+        for at, wake in sorted(wakes.items())
+    ]
+    return {
+        "generated_at": now.isoformat(),
+        "next_wake": ordered[0]["at"] if ordered else None,
+        "wakes": ordered,
+    }
+
+
+async def build_plan(db: AsyncSupabase | None = None, now: datetime | None = None) -> dict:
+    """
+    Load the stored events and plan from them (python run.py --plan). A client
+    created here is closed again; a db passed in is left open.
+    """
+    own_db = db is None
+    if own_db:
+        db = AsyncSupabase()
+    try:
+        events = await db.fetch_existing_events()
+    finally:
+        if own_db:
+            await db.aclose()
+    return plan_wakeups(events, now or datetime.now(timezone.utc))
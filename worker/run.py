@@ -2,17 +2,38 @@
 Entrypoint for local runs and GitHub Actions.
 Usage:
     python run.py
+    python run.py --full        # ignore the incremental sync state, re-fetch every game
+    python run.py --daemon      # keep running, polling adaptively (see daemon.py)
+    python run.py --plan        # print the next useful run times as JSON (see planner.py)
     TEST_MODE=true python run.py
 """
+import argparse
 import asyncio
+import json
 import sys
 
+from config import FULL_SYNC
 from sync import sync_all
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Sync NBA playoff games and bets to Supabase.")
+    parser.add_argument("--full", action="store_true", default=FULL_SYNC,
+                        help="re-fetch every postseason game instead of the incremental window")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running and sync on an adaptive schedule until SIGTERM")
+    parser.add_argument("--plan", action="store_true",
+                        help="print the schedule of upcoming tip-offs, expected finals and bet deadlines as JSON")
+    args = parser.parse_args()
     try:
-        asyncio.run(sync_all())
+        if args.plan:
+            from planner import build_plan
+            print(json.dumps(asyncio.run(build_plan()), indent=2))
+        elif args.daemon:
+            from daemon import run_daemon
+            asyncio.run(run_daemon(full_resync=args.full))
+        else:
+            asyncio.run(sync_all(full_resync=args.full))
         return 0
     except Exception as exc:
         print(f"::error::{exc}" if __import__("os").environ.get("GITHUB_ACTIONS") else f"Error: {exc}",
@@ -0,0 +1,74 @@
+"""
+Step 6 scoring engine.
+
+Bets for every resolved event are read with one paginated bulk query (see
+supabase_client.iter_event_bets). Each event is scored as soon as its group of
+bets has arrived, and its writes run on a bounded pool while later pages are
+still loading, instead of paying every round-trip in series.
+"""
+import asyncio
+import time
+
+from async_db import AsyncSupabase
+from config import SCORING_CONCURRENCY
+from models import score_event
+
+
+async def score_resolved_events(
+    db: AsyncSupabase,
+    resolved_event_states: dict[str, dict],
+    max_concurrency: int = SCORING_CONCURRENCY,
+) -> list[dict]:
+    """
+    Score every event in resolved_event_states (event_id -> resolved event row).
+
+    At most max_concurrency score writes are in flight at once. Returns one
+    timing record per event, in completion order:
+        {"event_id", "bets_scored", "fetch_s", "score_s", "write_s"}
+    fetch_s is the time until the event's bets had fully arrived. Events
+    without placed bets are reported with bets_scored == 0.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    start = time.monotonic()
+
+    async def _score_event(event_id: str, bets: list[dict], fetch_s: float) -> dict:
+        t0 = time.monotonic()
+        points = score_event(resolved_event_states[event_id], bets)
+        point_updates = [
+            (
+                bet["id"],
+                {
+                    "pointsGained": pts,
+                    "pointsGainedWinMargin": pts_margin,
+                },
+            )
+            for bet, (pts, pts_margin) in zip(bets, points)
+        ]
+        t1 = time.monotonic()
+
+        async with semaphore:
+            await db.update_bets_points(point_updates)
+        t2 = time.monotonic()
+
+        return {
+            "event_id": event_id,
+            "bets_scored": len(point_updates),
+            "fetch_s": fetch_s,
+            "score_s": t1 - t0,
+            "write_s": t2 - t1,
+        }
+
+    tasks: list[asyncio.Task] = []
+    async for event_id, bets in db.iter_event_bets(list(resolved_event_states)):
+        fetch_s = time.monotonic() - start
+        tasks.append(asyncio.create_task(_score_event(event_id, bets, fetch_s)))
+
+    fetch_s = time.monotonic() - start
+    results = [await task for task in asyncio.as_completed(tasks)]
+    seen = {r["event_id"] for r in results}
+    results.extend(
+        {"event_id": event_id, "bets_scored": 0, "fetch_s": fetch_s, "score_s": 0.0, "write_s": 0.0}
+        for event_id in resolved_event_states
+        if event_id not in seen
+    )
+    return results
@@ -0,0 +1,77 @@
+"""
+Vectorised NumPy scoring backend for large events.
+
+score_event switches to this backend when an event has at least
+VECTOR_SCORING_MIN_BETS bets and NumPy is installed. NumPy is optional — when
+it is missing, AVAILABLE is False and the pure-Python path is always used.
+Results are identical to _calc_game_points / _calc_series_points.
+"""
+from config import SCORING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+AVAILABLE = np is not None
+
+
+def score_event_vectorized(event: dict, bets: list[dict]) -> list[tuple[int, int]]:
+    """Vectorised equivalent of models.score_event — same inputs, same output."""
+    event_type = event.get("eventType", "")
+    rules = SCORING.get(event.get("round", ""), {})
+    if event_type not in ("game", "playin", "series") or not bets:
+        return [(0, 0)] * len(bets)
+
+    actual_winner = (
+        event["team1"] if event["team1Score"] > event["team2Score"] else event["team2"]
+    )
+    correct, margin, has_margin = _bet_arrays(bets, actual_winner)
+
+    if event_type == "series":
+        pts, margin_pts = _series_points(event, rules, correct, margin, has_margin)
+    else:
+        pts, margin_pts = _game_points(event, rules, correct, margin, has_margin)
+    return list(zip(pts.tolist(), margin_pts.tolist()))
+
+
+def _bet_arrays(bets: list[dict], actual_winner: str):
+    """
+    Return (correct, margin, has_margin) arrays for the bets:
+      correct    -- bet picked actual_winner
+      margin     -- int(winMargin), 0 where it is null
+      has_margin -- winMargin is not null
+    """
+    correct = np.array([b.get("winnerTeam") == actual_winner for b in bets], dtype=bool)
+    # float dtype turns null margins into NaN, which doubles as the null mask
+    raw_margin = np.array([b.get("winMargin") for b in bets], dtype=float)
+    has_margin = ~np.isnan(raw_margin)
+    margin = np.where(has_margin, raw_margin, 0).astype(np.int64)
+    return correct, margin, has_margin
+
+
+def _game_points(event, rules, correct, margin, has_margin):
+    actual_diff = abs(event["team1Score"] - event["team2Score"])
+    pts = np.where(correct, rules.get("correctWinnerPoints", 0), 0)
+
+    eligible = correct & has_margin
+    if not eligible.any():
+        return pts, np.zeros_like(pts)
+
+    delta = np.abs(margin - actual_diff)
+    min_delta = delta[eligible].min()
+    margin_pts = np.where(
+        delta == 0,
+        rules.get("correctScoreDifferenceExact", 0),
+        np.where(delta == min_delta, rules.get("correctScoreDifferenceClosest", 0), 0),
+    )
+    return pts, np.where(correct, margin_pts, 0)
+
+
+def _series_points(event, rules, correct, margin, has_margin):
+    actual_games = int(event.get("gameNumber") or 0)
+    series_pts = rules.get("correctWinnerSeries", 0)
+    pts = np.where(correct, series_pts, 0)
+    exact_games = correct & has_margin & (margin == actual_games)
+    margin_pts = np.where(exact_games, rules.get("correctWinnerExactGames", 0) - series_pts, 0)
+    return pts, margin_pts
@@ -0,0 +1,359 @@
+"""
+SQLite storage backend — a local stand-in for Supabase.
+
+Implements the same functions as supabase_client (see async_db.BACKEND_FUNCTIONS)
+over a SQLite database with the worker's slice of the schema: events, bets and
+users. The semantics match the PostgREST queries they replace: the
+events!inner(season) joins, the pointsGained / winnerTeam null checks, paged
+reads ordered the same way, chunked bulk writes and the (eventId, userId)
+unique index behind BET_INSERT_ON_CONFLICT.
+
+Select it with STORAGE_BACKEND=sqlite (database file SQLITE_PATH, ":memory:"
+for a throwaway one) to run the whole pipeline offline; bench_pipeline.py uses
+it to measure query counts and latency at realistic scale. Every statement
+goes through SqliteClient.execute, which counts it and its time.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+from bet_index import BetPairIndex
+from config import (
+    APP_SEASON,
+    BET_SCORE_CHUNK_SIZE,
+    EVENT_WRITE_CHUNK_SIZE,
+    SQLITE_PATH,
+    STATUS_RESOLVED,
+    SUPABASE_PAGE_SIZE,
+)
+from supabase_client import BET_SCORING_COLUMNS, EVENT_COLUMNS, _chunked
+
+# Bound parameters per IN (...) list, well under SQLite's variable limit.
+IN_CHUNK_SIZE = 500
+
+SCHEMA = """
+create table if not exists events (
+    "id" text primary key,
+    "team1" text,
+    "team2" text,
+    "team1Score" integer,
+    "team2Score" integer,
+    "startTime" text,
+    "parentEvent" text,
+    "status" integer not null,
+    "eventType" text,
+    "round" text,
+    "gameNumber" integer,
+    "season" integer not null,
+    "created_at" text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    "updated_at" text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+create index if not exists events_season on events ("season", "parentEvent");
+create trigger if not exists events_touch_updated_at after update on events
+begin
+    update events set "updated_at" = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now') where "id" = new."id";
+end;
+
+create table if not exists users (
+    "uuid" text primary key,
+    "is_active" integer not null default 1
+);
+
+create table if not exists bets (
+    "id" integer primary key autoincrement,
+    "eventId" text not null references events ("id"),
+    "userId" text not null,
+    "closeTime" text,
+    "eventType" text,
+    "calcFunc" text,
+    "winnerTeam" text,
+    "winMargin" integer,
+    "pointsGained" integer,
+    "pointsGainedWinMargin" integer,
+    "created_at" text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+create unique index if not exists bets_event_user_key on bets ("eventId", "userId");
+"""
+
+_EVENT_TABLE_COLUMNS = (*EVENT_COLUMNS, "created_at", "updated_at")
+
+# Sets each key present in a row of the JSON array and leaves the other
+# columns alone, like the bulk_update_events function in Supabase.
+_BULK_UPDATE_EVENTS = "update events set " + ", ".join(
+    f"\"{col}\" = case when json_type(r.value, '$.{col}') is null then events.\"{col}\" "
+    f"else json_extract(r.value, '$.{col}') end"
+    for col in EVENT_COLUMNS if col != "id"
+) + " from json_each(?) r where events.\"id\" = json_extract(r.value, '$.id')"
+
+
+class SqliteClient:
+    """
+    One shared connection, safe to use from async_db's worker threads.
+
+    Statements are serialised with a lock; stats counts them ("queries") and
+    their execution time ("seconds", excluding lock waits), and by_kind counts
+    them per statement kind.
+    """
+
+    def __init__(self, path: str | Path = SQLITE_PATH):
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.stats = {"queries": 0, "seconds": 0.0}
+        self.by_kind: dict[str, int] = defaultdict(int)
+        with self.lock:
+            self.conn.executescript(SCHEMA)
+
+    def execute(self, sql: str, params: Sequence = ()) -> list[dict]:
+        """Run one statement (in its own transaction) and return its rows as dicts."""
+        with self.lock:
+            t0 = time.monotonic()
+            rows = [dict(row) for row in self.conn.execute(sql, params)]
+            self._record(sql, time.monotonic() - t0)
+        return rows
+
+    def executemany(self, sql: str, param_rows: Iterable[Sequence]) -> int:
+        """Run one statement for every parameter row in a single transaction; returns rows changed."""
+        with self.lock:
+            t0 = time.monotonic()
+            before = self.conn.total_changes
+            self.conn.execute("begin")
+            try:
+                self.conn.executemany(sql, param_rows)
+                self.conn.execute("commit")
+            except BaseException:
+                self.conn.execute("rollback")
+                raise
+            finally:
+                self._record(sql, time.monotonic() - t0)
+            return self.conn.total_changes - before
+
+    def _record(self, sql: str, seconds: float) -> None:
+        self.stats["queries"] += 1
+        self.stats["seconds"] += seconds
+        self.by_kind[sql.split(None, 1)[0].lower()] += 1
+
+    def summary(self) -> str:
+        kinds = " · ".join(f"{n} {kind}" for kind, n in sorted(self.by_kind.items()))
+        return f"{self.stats['queries']} queries ({kinds}) · {self.stats['seconds']:.3f}s"
+
+
+def connect(max_connections: int = 1, path: str | Path = SQLITE_PATH) -> SqliteClient:
+    """Storage-backend entry point (see async_db). SQLite needs no pool; max_connections is unused."""
+    return SqliteClient(path)
+
+
+def close(client: SqliteClient) -> None:
+    with client.lock:
+        client.conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+def fetch_existing_events(client: SqliteClient) -> list[dict]:
+    """Fetch all events for the current app season."""
+    return client.execute("select * from events where season = ?", (APP_SEASON,))
+
+
+def fetch_events_changed_since(client: SqliteClient, column: str, since: str) -> list[dict]:
+    """Fetch current-season events whose change column is at or after since (boundary rows repeat)."""
+    if column not in _EVENT_TABLE_COLUMNS:
+        raise ValueError(f"events has no column {column!r}")
+    return client.execute(
+        f'select * from events where season = ? and "{column}" >= ?', (APP_SEASON, since)
+    )
+
+
+def fetch_events_by_parent(client: SqliteClient, parent_ids: list[str]) -> list[dict]:
+    """Fetch the current-season event rows (EVENT_COLUMNS) whose parentEvent is in parent_ids."""
+    rows: list[dict] = []
+    for chunk in _chunked(parent_ids, IN_CHUNK_SIZE):
+        rows += client.execute(
+            f"select {_columns(EVENT_COLUMNS)} from events "
+            f'where season = ? and "parentEvent" in ({_marks(chunk)})',
+            (APP_SEASON, *chunk),
+        )
+    return rows
+
+
+def insert_events(client: SqliteClient, events: list[dict]) -> list[dict]:
+    """Insert new event rows. Returns the inserted rows as stored."""
+    if not events:
+        return []
+    columns = list(dict.fromkeys(col for ev in events for col in ev))
+    client.executemany(
+        f"insert into events ({_columns(columns)}) values ({_marks(columns)})",
+        ([ev.get(col) for col in columns] for ev in events),
+    )
+    ids = [ev["id"] for ev in events]
+    inserted: list[dict] = []
+    for chunk in _chunked(ids, IN_CHUNK_SIZE):
+        inserted += client.execute(f'select * from events where "id" in ({_marks(chunk)})', chunk)
+    return inserted
+
+
+def update_events(
+    client: SqliteClient,
+    updates: list[tuple[dict, dict]],
+    chunk_size: int = EVENT_WRITE_CHUNK_SIZE,
+) -> tuple[int, list[tuple[str, str]]]:
+    """
+    Write only the changed columns, one UPDATE ... FROM json_each(?) per chunk
+    — the bulk_update_events RPC (see supabase_client.update_events).
+
+    A failing chunk is retried row by row. Returns (rows_written, failures).
+    """
+    rows = [{"id": stored["id"], **changes} for stored, changes in updates if changes]
+
+    written = 0
+    failures: list[tuple[str, str]] = []
+    for chunk in _chunked(rows, chunk_size):
+        try:
+            client.executemany(_BULK_UPDATE_EVENTS, [(json.dumps(chunk),)])
+            written += len(chunk)
+        except sqlite3.Error:
+            for row in chunk:
+                data = {col: value for col, value in row.items() if col != "id"}
+                assignments = ", ".join(f'"{col}" = ?' for col in data)
+                try:
+                    client.executemany(f'update events set {assignments} where "id" = ?', [(*data.values(), row["id"])])
+                    written += 1
+                except sqlite3.Error as exc:
+                    failures.append((row["id"], str(exc)))
+    return written, failures
+
+
+# ---------------------------------------------------------------------------
+# Users
+# ---------------------------------------------------------------------------
+
+def fetch_all_user_ids(client: SqliteClient) -> list[str]:
+    """Return UUIDs of all active users (is_active = true)."""
+    return [row["uuid"] for row in client.execute("select uuid from users where is_active")]
+
+
+# ---------------------------------------------------------------------------
+# Bets
+# ---------------------------------------------------------------------------
+
+def fetch_existing_bet_pairs(client: SqliteClient, page_size: int = SUPABASE_PAGE_SIZE) -> BetPairIndex:
+    """Return an index of the (eventId, userId) pairs that already have a bet row."""
+    index = BetPairIndex()
+    last_id = -1
+    # Keyset pages (id > last seen) instead of OFFSET, which rescans every earlier row.
+    while True:
+        rows = client.execute(
+            'select b."id", b."eventId", b."userId" from bets b '
+            'join events e on e."id" = b."eventId" where e.season = ? and b."id" > ? '
+            'order by b."id" limit ?',
+            (APP_SEASON, last_id, page_size),
+        )
+        for row in rows:
+            index.add(row["eventId"], str(row["userId"]))
+        if len(rows) < page_size:
+            return index
+        last_id = rows[-1]["id"]
+
+
+def fetch_unscored_resolved_event_ids(client: SqliteClient) -> list[str]:
+    """Return event IDs that are resolved but still have unscored placed bets."""
+    rows = client.execute(
+        'select distinct b."eventId" from bets b join events e on e."id" = b."eventId" '
+        'where b."pointsGained" is null and b."winnerTeam" is not null '
+        "and e.status = ? and e.season = ?",
+        (STATUS_RESOLVED, APP_SEASON),
+    )
+    return [row["eventId"] for row in rows]
+
+
+def iter_event_bets(
+    client: SqliteClient,
+    event_ids: list[str],
+    page_size: int = SUPABASE_PAGE_SIZE,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Yield (event_id, placed bets) for every event in event_ids that has any, in eventId order."""
+    columns = _columns(col.strip() for col in BET_SCORING_COLUMNS.split(","))
+    current_id: str | None = None
+    current_bets: list[dict] = []
+    # Sorted chunks keep the eventId order across the IN (...) lists.
+    for chunk in _chunked(sorted(event_ids), IN_CHUNK_SIZE):
+        for row in _paginate(
+            client,
+            f'select {columns} from bets where "eventId" in ({_marks(chunk)}) '
+            'and "winnerTeam" is not null order by "eventId", "id"',
+            chunk,
+            page_size,
+        ):
+            if row["eventId"] != current_id:
+                if current_bets:
+                    yield current_id, current_bets
+                current_id, current_bets = row["eventId"], []
+            current_bets.append(row)
+    if current_bets:
+        yield current_id, current_bets
+
+
+def insert_bets(client: SqliteClient, bets: list[dict], skip_conflicts: bool = False) -> int:
+    """
+    Bulk insert bet rows. Returns the number of rows inserted.
+
+    With skip_conflicts, rows whose (eventId, userId) already exists are
+    skipped (ON CONFLICT DO NOTHING) and not counted.
+    """
+    if not bets:
+        return 0
+    columns = list(dict.fromkeys(col for bet in bets for col in bet))
+    conflict = ' on conflict ("eventId", "userId") do nothing' if skip_conflicts else ""
+    return client.executemany(
+        f"insert into bets ({_columns(columns)}) values ({_marks(columns)}){conflict}",
+        ([bet.get(col) for col in columns] for bet in bets),
+    )
+
+
+def update_bets_points(
+    client: SqliteClient,
+    updates: list[tuple[str, dict]],
+    chunk_size: int = BET_SCORE_CHUNK_SIZE,
+) -> int:
+    """Write pointsGained / pointsGainedWinMargin, one UPDATE ... WHERE id IN (...) per points group and chunk."""
+    ids_by_points: dict[tuple, list] = defaultdict(list)
+    for bet_id, data in updates:
+        ids_by_points[tuple(sorted(data.items()))].append(bet_id)
+
+    for points, bet_ids in ids_by_points.items():
+        assignments = ", ".join(f'"{col}" = ?' for col, _ in points)
+        values = [value for _, value in points]
+        for chunk in _chunked(bet_ids, min(chunk_size, IN_CHUNK_SIZE)):
+            client.execute(
+                f'update bets set {assignments} where "id" in ({_marks(chunk)})', (*values, *chunk)
+            )
+    return len(updates)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _columns(columns: Iterable[str]) -> str:
+    return ", ".join(f'"{col}"' for col in columns)
+
+
+def _marks(values: Sequence) -> str:
+    return ", ".join("?" * len(values))
+
+
+def _paginate(client: SqliteClient, sql: str, params: Sequence, page_size: int) -> Iterator[dict]:
+    """Yield every row of an ordered select, one LIMIT / OFFSET page at a time."""
+    offset = 0
+    while True:
+        rows = client.execute(f"{sql} limit ? offset ?", (*params, page_size, offset))
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
@@ -0,0 +1,109 @@
+"""
+Resident Supabase state for the daemon (see daemon.py).
+
+A one-shot run reads the whole events table, every bet pair and the user list
+(sync.load_snapshot). A StateStore loads that once and then keeps it current
+between ticks:
+
+  - events are refreshed incrementally: only rows whose STATE_CHANGE_COLUMN
+    (a timestamp or change counter kept by the database, e.g. an updated_at
+    trigger) is at or after the largest value seen so far. When the events
+    table has no such column the store falls back to a full events reload.
+  - bet pairs are never re-read: the worker is the only writer of bet rows, so
+    the pairs it creates are added to the index as they are inserted.
+  - the active-user list is one small query and is re-read every tick.
+
+The worker's own event inserts and updates are applied to the store as they
+are written (sync_all does this). Rows deleted in the database are only
+noticed by a full reload; invalidate() forces one on the next refresh.
+"""
+import asyncio
+from collections.abc import Iterable
+
+from async_db import AsyncSupabase
+from bet_index import BetPairIndex
+from config import STATE_CHANGE_COLUMN
+from timing import timed
+
+
+class StateStore:
+    """Events by parentEvent, bet pairs and user ids, refreshed incrementally."""
+
+    def __init__(self, change_column: str = STATE_CHANGE_COLUMN):
+        self.change_column = change_column
+        self.events_by_parent: dict[str, dict] = {}
+        self.bet_pairs = BetPairIndex()
+        self.user_ids: list[str] = []
+        self.watermark: str | None = None
+        self.loaded = False
+        self.bet_pairs_loaded = False
+
+    def invalidate(self) -> None:
+        """Make the next refresh reload events and bet pairs from scratch."""
+        self.loaded = False
+        self.bet_pairs_loaded = False
+        self.watermark = None
+
+    async def refresh(
+        self,
+        db: AsyncSupabase,
+        include_users: bool = True,
+        include_bet_pairs: bool = True,
+    ) -> dict:
+        """
+        Bring the store up to date and return it in sync.load_snapshot's shape:
+        {"events", "events_by_parent", "bet_pairs", "user_ids", "timings"},
+        plus "events_mode" ("full" or "incremental"). The dicts and the index
+        are the store's own, so writes to them stick.
+        """
+        incremental = self.loaded and self.watermark is not None
+        if incremental:
+            parts = {"events": db.fetch_events_changed_since(self.change_column, self.watermark)}
+        else:
+            parts = {"events": db.fetch_existing_events()}
+        if include_bet_pairs and not self.bet_pairs_loaded:
+            parts["bet_pairs"] = db.fetch_existing_bet_pairs()
+        if include_users:
+            parts["user_ids"] = db.fetch_all_user_ids()
+        results = await asyncio.gather(*(timed(p) for p in parts.values()))
+        fetched = {name: result for name, (result, _) in zip(parts, results)}
+
+        if not incremental:
+            self.events_by_parent = {}
+        self.apply_events(fetched["events"])
+        self._advance_watermark(fetched["events"], incremental)
+        if "bet_pairs" in fetched:
+            self.bet_pairs = fetched["bet_pairs"]
+            self.bet_pairs_loaded = True
+        self.user_ids = fetched.get("user_ids", [])
+        self.loaded = True
+
+        timings = {name: secs for name, (_, secs) in zip(parts, results)}
+        return {
+            "events": list(self.events_by_parent.values()),
+            "events_by_parent": self.events_by_parent,
+            "bet_pairs": self.bet_pairs,
+            "user_ids": self.user_ids,
+            "timings": timings,
+            "events_mode": "incremental" if incremental else "full",
+        }
+
+    def apply_events(self, rows: Iterable[dict]) -> None:
+        """Record inserted or re-read event rows."""
+        for row in rows:
+            if row.get("parentEvent"):
+                self.events_by_parent[str(row["parentEvent"])] = row
+
+    def apply_event_updates(self, updates: Iterable[tuple[dict, dict]], failed_ids: Iterable[str] = ()) -> None:
+        """Merge written (stored_row, changes) pairs into the stored rows, skipping failed writes."""
+        failed = set(failed_ids)
+        for stored, changes in updates:
+            if stored.get("id") not in failed:
+                stored.update(changes)
+
+    def _advance_watermark(self, rows: list[dict], incremental: bool) -> None:
+        values = [row[self.change_column] for row in rows if row.get(self.change_column) is not None]
+        if incremental:
+            values.append(self.watermark)
+        # No change column on a full load: keep reloading in full.
+        self.watermark = max(values) if values else None
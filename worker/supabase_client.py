@@ -1,11 +1,75 @@
-from supabase import create_client, Client
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
 
-from config import SUPABASE_URL, SUPABASE_ANON_KEY, APP_SEASON
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod
+from supabase import create_client, Client, ClientOptions
 
+from bet_index import BetPairIndex
+from config import (
+    SUPABASE_URL,
+    SUPABASE_ANON_KEY,
+    APP_SEASON,
+    BET_SCORE_CHUNK_SIZE,
+    EVENT_WRITE_CHUNK_SIZE,
+    DB_WRITE_ATTEMPTS,
+    SUPABASE_PAGE_SIZE,
+    SUPABASE_MAX_CONCURRENCY,
+)
 
-def get_supabase_client() -> Client:
-    """Create and return a Supabase client."""
-    return create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+T = TypeVar("T")
+
+# Event columns the worker owns — the same set insert_events writes and
+# fetch_events_by_parent reads.
+EVENT_COLUMNS = (
+    "id", "team1", "team2", "team1Score", "team2Score", "startTime", "parentEvent",
+    "status", "eventType", "round", "gameNumber", "season",
+)
+
+# Bet columns needed to score an event — everything else stays in the database.
+BET_SCORING_COLUMNS = "id, userId, eventId, winnerTeam, winMargin, pointsGained"
+
+
+def get_supabase_client(max_connections: int = SUPABASE_MAX_CONCURRENCY) -> Client:
+    """
+    Create and return a Supabase client.
+
+    All requests share one HTTP/2 keep-alive connection pool, so concurrent
+    calls (see async_db) reuse connections instead of re-handshaking.
+    """
+    http_client = httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        ),
+    )
+    client = create_client(
+        SUPABASE_URL, SUPABASE_ANON_KEY, options=ClientOptions(httpx_client=http_client)
+    )
+    # The PostgREST client is created lazily; build it now so worker threads
+    # never race to initialise it.
+    client.postgrest
+    return client
+
+
+def connect(max_connections: int = SUPABASE_MAX_CONCURRENCY) -> Client:
+    """Storage-backend entry point (see async_db): the pooled Supabase client."""
+    return get_supabase_client(max_connections)
+
+
+def close(supabase: Client) -> None:
+    """Close the pooled HTTP client behind a client from get_supabase_client."""
+    http_client = supabase.options.httpx_client
+    if http_client is not None:
+        http_client.close()
 
 
 def fetch_existing_events(supabase: Client) -> list[dict]:
@@ -14,6 +78,32 @@ def fetch_existing_events(supabase: Client) -> list[dict]:
     return response.data or []
 
 
+def fetch_events_changed_since(supabase: Client, column: str, since: str) -> list[dict]:
+    """Fetch current-season events whose change column is at or after since (boundary rows repeat)."""
+    response = (
+        supabase.table("events")
+        .select("*")
+        .eq("season", APP_SEASON)
+        .gte(column, since)
+        .execute()
+    )
+    return response.data or []
+
+
+def fetch_events_by_parent(supabase: Client, parent_ids: list[str]) -> list[dict]:
+    """Fetch the current-season event rows (EVENT_COLUMNS) whose parentEvent is in parent_ids."""
+    if not parent_ids:
+        return []
+    response = (
+        supabase.table("events")
+        .select(", ".join(EVENT_COLUMNS))
+        .eq("season", APP_SEASON)
+        .in_("parentEvent", parent_ids)
+        .execute()
+    )
+    return response.data or []
+
+
 def insert_events(supabase: Client, events: list[dict]) -> list[dict]:
     """Insert new event rows into Supabase. Returns inserted rows."""
     if not events:
@@ -22,16 +112,45 @@ def insert_events(supabase: Client, events: list[dict]) -> list[dict]:
     return response.data or []
 
 
-def update_event(supabase: Client, event_id: str, updates: dict) -> dict | None:
-    """Update an existing event row in Supabase."""
-    response = (
-        supabase.table("events")
-        .update(updates)
-        .eq("id", event_id)
-        .execute()
-    )
-    data = response.data
-    return data[0] if data else None
+def update_events(
+    supabase: Client,
+    updates: list[tuple[dict, dict]],
+    chunk_size: int = EVENT_WRITE_CHUNK_SIZE,
+) -> tuple[int, list[tuple[str, str]]]:
+    """
+    Write event updates, sending only the columns that changed.
+
+    updates is a list of (stored_row, changes) pairs; pairs with no changes
+    are ignored. Each chunk of chunk_size rows is one call to the
+    bulk_update_events RPC (see README), which sets only the keys present in
+    each row, so different score changes still share a request and edits made
+    in the database meanwhile (a corrected round, team name or startTime) are
+    not overwritten by the run's snapshot. If a chunk still fails after
+    retries, its rows are written one by one so a single bad row cannot sink
+    the whole batch.
+
+    Returns (rows_written, failures) where failures is [(event_id, error)].
+    """
+    rows = [{"id": stored["id"], **changes} for stored, changes in updates if changes]
+
+    written = 0
+    failures: list[tuple[str, str]] = []
+    for chunk in _chunked(rows, chunk_size):
+        try:
+            _execute_with_retry(
+                lambda: supabase.rpc("bulk_update_events", {"rows": chunk}).execute()
+            )
+            written += len(chunk)
+        except (APIError, httpx.HTTPError):
+            for row in chunk:
+                event_id, data = row["id"], {k: v for k, v in row.items() if k != "id"}
+                try:
+                    supabase.table("events").update(data).eq("id", event_id).execute()
+                    written += 1
+                except (APIError, httpx.HTTPError) as exc:
+                    failures.append((event_id, str(exc)))
+
+    return written, failures
 
 
 def fetch_all_user_ids(supabase: Client) -> list[str]:
@@ -45,15 +164,48 @@ def fetch_all_user_ids(supabase: Client) -> list[str]:
     return [row["uuid"] for row in (response.data or [])]
 
 
-def fetch_existing_bet_pairs(supabase: Client) -> set[tuple[str, str]]:
-    """Return the set of (eventId, userId) pairs that already have a bet row."""
-    response = (
-        supabase.table("bets")
-        .select("eventId, userId, events!inner(season)")
-        .eq("events.season", APP_SEASON)
-        .execute()
-    )
-    return {(row["eventId"], str(row["userId"])) for row in (response.data or [])}
+def fetch_existing_bet_pairs(
+    supabase: Client,
+    page_size: int = SUPABASE_PAGE_SIZE,
+) -> BetPairIndex:
+    """
+    Return an index of the (eventId, userId) pairs that already have a bet row.
+
+    Rows are streamed into a compact BetPairIndex in keyset pages (id greater
+    than the last id seen), so no page makes the server rescan earlier rows
+    the way an OFFSET would. The first page also asks for an exact count, and
+    the total is checked against it: a page cut short by PostgREST's row limit
+    fails loudly instead of making Step 5 re-create bets.
+    """
+    index = BetPairIndex()
+    rows_read = 0
+    expected: int | None = None
+    last_id = None
+    while True:
+        first_page = last_id is None
+        query = supabase.table("bets").select(
+            "id, eventId, userId, events!inner(season)",
+            count=CountMethod.exact if first_page else None,
+        ).eq("events.season", APP_SEASON)
+        if not first_page:
+            query = query.gt("id", last_id)
+        response = query.order("id").limit(page_size).execute()
+        if first_page:
+            expected = response.count
+        rows = response.data or []
+        for row in rows:
+            index.add(row["eventId"], str(row["userId"]))
+        rows_read += len(rows)
+        if len(rows) < page_size:
+            break
+        last_id = rows[-1]["id"]
+
+    if expected is not None and rows_read != expected:
+        raise RuntimeError(
+            f"Loaded {rows_read} of {expected} bet rows — lower SUPABASE_PAGE_SIZE "
+            "to the project's max rows setting"
+        )
+    return index
 
 
 def fetch_unscored_resolved_event_ids(supabase: Client) -> list[str]:
@@ -74,27 +226,126 @@ def fetch_unscored_resolved_event_ids(supabase: Client) -> list[str]:
     return list({row["eventId"] for row in (response.data or [])})
 
 
-def fetch_event_bets(supabase: Client, event_id: str) -> list[dict]:
-    """Fetch all bet rows for a specific event."""
-    response = (
-        supabase.table("bets")
-        .select("*")
-        .eq("eventId", event_id)
-        .execute()
-    )
-    return response.data or []
+def iter_event_bets(
+    supabase: Client,
+    event_ids: list[str],
+    page_size: int = SUPABASE_PAGE_SIZE,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Yield (event_id, placed bets) for every event in event_ids that has any.
+
+    All events are read with a single paginated in_("eventId", ...) query,
+    selecting only BET_SCORING_COLUMNS and skipping unplaced bets. Rows are
+    ordered by eventId, so each event's group is complete when it is yielded
+    and callers can start scoring it while later pages are still loading.
+    """
+    if not event_ids:
+        return
+
+    def query():
+        return (
+            supabase.table("bets")
+            .select(BET_SCORING_COLUMNS)
+            .in_("eventId", event_ids)
+            .not_.is_("winnerTeam", "null")
+            .order("eventId")
+            .order("id")
+        )
 
+    current_id: str | None = None
+    current_bets: list[dict] = []
+    for row in _paginate(query, page_size):
+        if row["eventId"] != current_id:
+            if current_bets:
+                yield current_id, current_bets
+            current_id, current_bets = row["eventId"], []
+        current_bets.append(row)
+    if current_bets:
+        yield current_id, current_bets
 
-def insert_bets(supabase: Client, bets: list[dict]) -> int:
-    """Bulk insert bet rows. Returns the number of rows inserted."""
+
+def insert_bets(supabase: Client, bets: list[dict], skip_conflicts: bool = False) -> int:
+    """
+    Bulk insert bet rows. Returns the number of rows inserted.
+
+    With skip_conflicts, rows whose (eventId, userId) already exists are
+    silently skipped by the database (ON CONFLICT DO NOTHING) and are not
+    counted. This relies on a unique index on bets ("eventId", "userId").
+    """
     if not bets:
         return 0
-    response = supabase.table("bets").insert(bets).execute()
+    if skip_conflicts:
+        query = supabase.table("bets").upsert(
+            bets, on_conflict="eventId,userId", ignore_duplicates=True
+        )
+    else:
+        query = supabase.table("bets").insert(bets)
+    response = query.execute()
     return len(response.data or [])
 
 
-def update_bets_points(supabase: Client, updates: list[tuple[str, dict]]) -> int:
-    """Write pointsGained / pointsGainedWinMargin for each (bet_id, data) pair."""
+def update_bets_points(
+    supabase: Client,
+    updates: list[tuple[str, dict]],
+    chunk_size: int = BET_SCORE_CHUNK_SIZE,
+) -> int:
+    """Write pointsGained / pointsGainedWinMargin for each (bet_id, data) pair.
+
+    Bets that scored the same points are written together: one
+    UPDATE ... WHERE id IN (...) per chunk of chunk_size IDs. A game only has a
+    handful of distinct point outcomes, so the number of requests depends on
+    the number of chunks rather than the number of bets.
+    """
+    ids_by_points: dict[tuple, list[str]] = defaultdict(list)
     for bet_id, data in updates:
-        supabase.table("bets").update(data).eq("id", bet_id).execute()
+        ids_by_points[tuple(sorted(data.items()))].append(bet_id)
+
+    for points, bet_ids in ids_by_points.items():
+        data = dict(points)
+        for chunk in _chunked(bet_ids, chunk_size):
+            _execute_with_retry(
+                lambda: supabase.table("bets").update(data).in_("id", chunk).execute()
+            )
     return len(updates)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield successive lists of at most `size` items."""
+    it = iter(items)
+    while chunk := list(islice(it, max(1, size))):
+        yield chunk
+
+
+def _fetch_pages(query: Callable[[], object], page_size: int) -> Iterator[object]:
+    """Yield the response for each .range() page of a select.
+
+    query must build a fresh, deterministically ordered select on each call.
+    """
+    start = 0
+    while True:
+        response = query().range(start, start + page_size - 1).execute()
+        yield response
+        if len(response.data or []) < page_size:
+            return
+        start += page_size
+
+
+def _paginate(query: Callable[[], object], page_size: int) -> Iterator[dict]:
+    """Yield every row of a select, one .range() page at a time."""
+    for response in _fetch_pages(query, page_size):
+        yield from response.data or []
+
+
+def _execute_with_retry(request: Callable[[], T], attempts: int = DB_WRITE_ATTEMPTS) -> T:
+    """Run a Supabase request, retrying transient failures with exponential backoff."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return request()
+        except (APIError, httpx.HTTPError):
+            if attempt >= attempts:
+                raise
+            time.sleep(0.5 * 2 ** (attempt - 1))
+    raise ValueError("attempts must be >= 1")
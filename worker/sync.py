@@ -1,25 +1,31 @@
+import asyncio
 import os
 import sys
 import time
-from datetime import datetime, timezone
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import aclosing, nullcontext
+from datetime import datetime, timedelta, timezone
 
 import httpx
 
-from config import STATUS_UPCOMING, STATUS_RESOLVED, STATUS_IN_PROGRESS, APP_SEASON, TARGET_USER_IDS, EVENTS_ONLY
-from bdl_client import fetch_bdl_games
-from supabase_client import (
-    get_supabase_client,
-    fetch_existing_events,
-    insert_events,
-    update_event,
-    fetch_all_user_ids,
-    fetch_existing_bet_pairs,
-    fetch_event_bets,
-    fetch_unscored_resolved_event_ids,
-    insert_bets,
-    update_bets_points,
+from config import (
+    STATUS_RESOLVED, APP_SEASON, TARGET_USER_IDS, EVENTS_ONLY,
+    INCREMENTAL_SYNC, FULL_SYNC, BET_INSERT_ON_CONFLICT, BDL_CACHE,
+    BDL_PARALLEL_FETCH, BDL_PARTITION_DAYS,
 )
-from models import compute_game_numbers, map_game_to_event, build_series_events, build_special_events, calculate_points, detect_round
+from bdl_client import BdlClient, BdlBudgetExceeded, PLAYOFFS_START_DATE, date_partitions, stream_bdl_games
+from bdl_cache import ResponseCache
+from sync_state import load_sync_state, save_sync_state, incremental_window, merge_window_games
+from async_db import AsyncSupabase
+from bet_index import BetPairIndex
+from models import (
+    Game, MatchupIndex, map_game_to_event, parse_start_time, game_event_update, build_series_events, build_special_events,
+    diff_event_update, EASTERN,
+)
+from planner import plan_wakeups
+from scoring import score_resolved_events
+from state_store import StateStore
+from timing import timed
 
 
 # ---------------------------------------------------------------------------
@@ -43,6 +49,10 @@ def _step(num: int, label: str, summary: str) -> None:
     print(f"  [{num}/{_TOTAL_STEPS}] {label} {pad} {summary}", flush=True)
 
 
+def _detail(text: str) -> None:
+    print(f"        {text}", flush=True)
+
+
 def _footer(elapsed: float) -> None:
     print(f"\n  ✓ Done in {elapsed:.1f}s", flush=True)
     if _GHA:
@@ -82,23 +92,180 @@ def _should_create_bet(event: dict) -> bool:
     return True
 
 
+def _missing_bet_rows(
+    events: Iterable[dict],
+    user_ids: Iterable[str],
+    existing_bet_pairs: BetPairIndex,
+) -> Iterator[dict]:
+    """Lazily yield a new bet row for every (event, user) pair that has no bet yet."""
+    user_ids = list(user_ids)
+    for ev in events:
+        ev_id = ev.get("id")
+        if not ev_id or not _should_create_bet(ev):
+            continue
+        for user_id in user_ids:
+            if (ev_id, str(user_id)) not in existing_bet_pairs:
+                yield {
+                    "eventId": ev_id,
+                    "userId": user_id,
+                    "closeTime": ev.get("startTime"),
+                    "eventType": ev.get("eventType"),
+                    "calcFunc": ev.get("round"),
+                }
+
+
+def _recorded(rows: Iterator[dict], index: BetPairIndex) -> Iterator[dict]:
+    """Pass bet rows through, adding each (eventId, userId) pair to index."""
+    for row in rows:
+        index.add(row["eventId"], row["userId"])
+        yield row
+
+
+def _schedule_outlook(games: list[Game], now: datetime) -> tuple[list[str], str | None]:
+    """
+    Return (live_game_ids, next_start): the BallDontLie ids of the games in
+    progress, and the earliest tip-off of a game that has not started yet.
+    Tip-offs up to three hours in the past still count (a delayed start), older
+    ones are ignored.
+    """
+    live_game_ids: list[str] = []
+    next_start: datetime | None = None
+    earliest = now - timedelta(hours=3)
+    for game in games:
+        if game.final:
+            continue
+        if game.period > 0:
+            live_game_ids.append(str(game.id))
+            continue
+        start_at = parse_start_time(game.start)
+        if start_at is not None and start_at >= earliest and (next_start is None or start_at < next_start):
+            next_start = start_at
+    return live_game_ids, next_start.isoformat() if next_start else None
+
+
+async def load_snapshot(
+    db: AsyncSupabase,
+    include_users: bool = True,
+    include_bet_pairs: bool = True,
+) -> dict:
+    """
+    Load the Supabase state the pipeline starts from, with all reads in parallel.
+
+    Returns {"events", "events_by_parent", "bet_pairs", "user_ids", "timings"};
+    events_by_parent maps parentEvent → event row and timings maps each part
+    to its own duration in seconds. user_ids is empty when include_users
+    is False (EVENTS_ONLY runs never create bets), and bet_pairs is an empty
+    index when include_bet_pairs is False (BET_INSERT_ON_CONFLICT runs).
+    """
+    parts = {"events": db.fetch_existing_events()}
+    if include_bet_pairs:
+        parts["bet_pairs"] = db.fetch_existing_bet_pairs()
+    if include_users:
+        parts["user_ids"] = db.fetch_all_user_ids()
+    results = await asyncio.gather(*(timed(p) for p in parts.values()))
+    snapshot = {"user_ids": [], "bet_pairs": BetPairIndex()}
+    snapshot.update((name, result) for name, (result, _) in zip(parts, results))
+    snapshot["events_by_parent"] = {
+        str(e["parentEvent"]): e for e in snapshot["events"] if e.get("parentEvent")
+    }
+    snapshot["timings"] = {name: secs for name, (_, secs) in zip(parts, results)}
+    return snapshot
+
+
+async def _fetch_games(
+    full_resync: bool,
+    started_at: datetime,
+    on_page: Callable[[list[Game]], Awaitable[None]] | None = None,
+    bdl: BdlClient | None = None,
+) -> tuple[list[Game], str]:
+    """
+    Step 1: fetch BDL games (incrementally when possible). Returns (games, summary).
+
+    Pages are streamed; on_page, if given, is awaited with each page of newly
+    fetched games as it arrives, while later pages are still loading. Every
+    game is parsed into a Game record once; the raw BDL dicts only go to the
+    sync state file. A caller-owned bdl client is reused and left open.
+    """
+    t0 = time.monotonic()
+    today = started_at.astimezone(EASTERN).date()
+    window = None
+    if INCREMENTAL_SYNC and not full_resync:
+        sync_state = load_sync_state()
+        window = incremental_window(sync_state, today)
+
+    fetch_range = window or (PLAYOFFS_START_DATE, None)
+    windows = date_partitions(*fetch_range, BDL_PARTITION_DAYS) if BDL_PARALLEL_FETCH else [fetch_range]
+    if bdl is None:
+        client_context = BdlClient(cache=ResponseCache() if BDL_CACHE else None)
+    else:
+        bdl.reset_stats()
+        client_context = nullcontext(bdl)
+    fetched: list[dict] = []
+    records: dict[str, Game] = {}
+    async with client_context as bdl:
+        async with aclosing(stream_bdl_games(bdl, windows, today=today)) as pages:
+            async for page in pages:
+                fetched.extend(page)
+                games = [Game.from_bdl(g) for g in page]
+                records.update((str(g.id), g) for g in games)
+                if on_page is not None:
+                    await on_page(games)
+
+    if window:
+        games_by_id = merge_window_games(sync_state["games"], fetched, window)
+    else:
+        games_by_id = {str(g["id"]): g for g in fetched}
+    if INCREMENTAL_SYNC:
+        save_sync_state({"watermark": started_at.isoformat(), "games": games_by_id})
+
+    summary = f"{len(games_by_id)} games"
+    if window:
+        summary += f" ({len(fetched)} re-fetched for {window[0]} → {window[1]})"
+    summary += f" · {bdl.stats['requests']} requests"
+    if bdl.stats["retries"]:
+        summary += f" ({bdl.stats['retries']} retried, {bdl.stats['throttled']} rate-limited)"
+    if bdl.cache is not None:
+        summary += f" · {bdl.cache.summary()}"
+    summary += f" · {time.monotonic() - t0:.2f}s"
+    games = [records.get(game_id) or Game.from_bdl(g) for game_id, g in games_by_id.items()]
+    return games, summary
+
+
 # ---------------------------------------------------------------------------
 # Main sync pipeline
 # ---------------------------------------------------------------------------
 
-async def sync_all() -> dict:
+async def sync_all(
+    full_resync: bool = FULL_SYNC,
+    db: AsyncSupabase | None = None,
+    bdl: BdlClient | None = None,
+    state: StateStore | None = None,
+) -> dict:
     """
     Full sync pipeline:
-      1. Fetch games from BallDontLie API
-      2. Load existing events & bet coverage from Supabase
+      1. Fetch games from BallDontLie API (incrementally unless full_resync)
+      2. Load existing events, bet coverage & users from Supabase (overlaps step 1)
       3. Sync game-level events (create new / update scores & status)
       4. Sync series-level events (create new / update win counts & status)
       5. Create bet rows for all users on newly added events
       6. Score resolved events — write pointsGained / pointsGainedWinMargin
+
+    A long-running caller (daemon.py) can pass its own db / bdl clients to reuse
+    connections, rate limiter and cache across runs, and a resident StateStore:
+    Step 2 then only refreshes what changed, and the events and bet pairs this
+    run writes are applied to the store.
+
+    The returned summary includes games_live (games in progress) and
+    live_game_ids (their BallDontLie ids), next_start (earliest tip-off of a
+    game that has not started, or None) and next_wake (the planner's next
+    useful run time, see planner.py, or None).
     """
     start = time.monotonic()
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    started_at = datetime.now(timezone.utc)
+    now = started_at.strftime("%Y-%m-%d %H:%M UTC")
     flags = []
+    if full_resync:
+        flags.append("FULL_SYNC")
     if EVENTS_ONLY:
         flags.append("EVENTS_ONLY")
     if TARGET_USER_IDS:
@@ -106,135 +273,203 @@ async def sync_all() -> dict:
     mode = f"  [{', '.join(flags)}]" if flags else ""
     _header(f"NBA Bet Sync — {now}{mode}")
 
-    supabase = get_supabase_client()
+    if db is None:
+        db = AsyncSupabase()
 
     # ------------------------------------------------------------------
-    # Step 1: Fetch games from BallDontLie
+    # Steps 1 & 2: Fetch games from BallDontLie while the Supabase snapshot
+    # (events, bet pairs, users) loads in parallel. BDL pages are streamed,
+    # and the per-game part of Step 3 runs on each page as it arrives.
     # ------------------------------------------------------------------
+    load = load_snapshot if state is None else state.refresh
+    snapshot_task = asyncio.create_task(load(
+        db,
+        include_users=not EVENTS_ONLY,
+        include_bet_pairs=not BET_INSERT_ON_CONFLICT,
+    ))
+    # Track events that resolved in this run — needed for Step 6
+    resolved_event_states: dict[str, dict] = {}
+    # Game, series and special-event updates are diffed against the stored
+    # rows and collected as (stored_row, changes); all real changes go out in
+    # one chunked bulk update at the end of Step 4.
+    event_updates: list[tuple[dict, dict]] = []
+    game_updated = 0
+    game_skipped = 0
+    transitions_checked: set = set()
+    snapshot_waits: list[float] = []
+
+    async def _snapshot() -> dict:
+        snapshot, waited = await timed(snapshot_task)
+        snapshot_waits.append(waited)
+        return snapshot
+
+    def _check_transition(game: Game, existing: dict) -> None:
+        nonlocal game_updated, game_skipped
+        transitions_checked.add(game.id)
+        update_data = game_event_update(game, existing)
+        if update_data.get("status") == STATUS_RESOLVED:
+            resolved_event_states[existing["id"]] = {**existing, **update_data}
+        changes = diff_event_update(existing, update_data)
+        if changes:
+            event_updates.append((existing, changes))
+            game_updated += 1
+        else:
+            game_skipped += 1
+
+    async def _on_page(page: list[Game]) -> None:
+        # Step 3, per page: status transitions of games that already have an
+        # event only need that game, so they are detected while later pages load.
+        by_parent = (await _snapshot())["events_by_parent"]
+        for game in page:
+            existing = by_parent.get(str(game.id))
+            if existing is not None:
+                _check_transition(game, existing)
+
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            bdl_games = await fetch_bdl_games(client)
-    except httpx.HTTPStatusError as exc:
-        _error(f"BallDontLie API error {exc.response.status_code}: {exc.response.text[:200]}")
+        bdl_games, fetch_summary = await _fetch_games(full_resync, started_at, on_page=_on_page, bdl=bdl)
+    except BaseException as exc:
+        snapshot_task.cancel()
+        if isinstance(exc, httpx.HTTPStatusError):
+            _error(f"BallDontLie API error {exc.response.status_code}: {exc.response.text[:200]}")
+        elif isinstance(exc, BdlBudgetExceeded):
+            _error(str(exc))
         raise
 
-    _step(1, "Fetch games", f"{len(bdl_games)} games")
+    _step(1, "Fetch games", fetch_summary)
+    live_game_ids, next_start = _schedule_outlook(bdl_games, started_at)
 
     if not bdl_games:
+        snapshot_task.cancel()
         _step(2, "Load events & bets", "skipped — no games")
         for n in range(3, _TOTAL_STEPS + 1):
             _step(n, ["Sync game events", "Sync series events",
                       "Create bets", "Score resolved bets"][n - 3], "—")
         _footer(time.monotonic() - start)
         return {"games_fetched": 0, "events_created": 0, "events_updated": 0,
-                "series_created": 0, "series_updated": 0, "bets_created": 0, "bets_scored": 0}
-
-    # ------------------------------------------------------------------
-    # Step 2: Load existing events & bet coverage
-    # ------------------------------------------------------------------
-    existing_events = fetch_existing_events(supabase)
-    existing_bet_pairs = fetch_existing_bet_pairs(supabase)
-
-    # Build lookup: parentEvent key → event dict (used for create/update decisions)
-    existing_by_parse: dict[str, dict] = {
-        str(e["parentEvent"]): e for e in existing_events if e.get("parentEvent")
-    }
-    _step(2, "Load events & bets",
-          f"{len(existing_events)} events · {len(existing_bet_pairs)} bets")
+                "series_created": 0, "series_updated": 0, "updates_skipped": 0, "update_failures": 0,
+                "bets_created": 0, "bets_scored": 0, "games_live": 0, "live_game_ids": [],
+                "next_start": None, "next_wake": None}
+
+    snapshot = await _snapshot()
+    existing_events = snapshot["events"]
+    existing_bet_pairs = snapshot["bet_pairs"]
+    # parentEvent key → event dict (used for create/update decisions)
+    existing_by_parse: dict[str, dict] = snapshot["events_by_parent"]
+    if BET_INSERT_ON_CONFLICT:
+        bets_loaded = "bet scan skipped [BET_INSERT_ON_CONFLICT]"
+    elif state is not None:
+        bets_loaded = f"{len(existing_bet_pairs)} bets (resident)"
+    else:
+        bets_loaded = f"{len(existing_bet_pairs)} bets"
+    events_mode = f" ({snapshot['events_mode']})" if state is not None else ""
+    _step(2, "Load events & bets", f"{len(existing_events)} events{events_mode} · {bets_loaded}")
+    _detail(
+        " · ".join(f"{part} {secs:.2f}s" for part, secs in snapshot["timings"].items())
+        + f" · overlapped with Step 1, waited {sum(snapshot_waits):.2f}s for it"
+    )
 
-    # Compute game numbers and rounds within each matchup.
-    # Round is derived from the matchup's first game so that a late Game 7
+    # Step 3, whole matchups: game numbers and rounds need every game of a
+    # matchup, so new games are mapped once the stream has finished. The
+    # matchup grouping is built once and shared with Step 4.
+    # Round is decided by the matchup's majority so that a late Game 7
     # isn't mis-classified as the next round when calendar windows overlap.
-    game_number_map, game_round_map = compute_game_numbers(bdl_games)
-
-    # Track events that resolved in this run — needed for Step 6
-    resolved_event_states: dict[str, dict] = {}
+    matchups = MatchupIndex(bdl_games)
+    game_number_map, game_round_map = matchups.game_numbers, matchups.game_rounds
 
     # ------------------------------------------------------------------
     # Step 3: Sync game-level events
     # ------------------------------------------------------------------
     new_game_events: list[dict] = []
-    game_updated = 0
-
     for game in bdl_games:
-        parse_key = str(game["id"])
-        game_number = game_number_map.get(game["id"], 1)
-        round_name = game_round_map.get(game["id"], "firstRound")
-        existing = existing_by_parse.get(parse_key)
-
+        existing = existing_by_parse.get(str(game.id))
         if existing is None:
+            game_number = game_number_map.get(game.id, 1)
+            round_name = game_round_map.get(game.id, "firstRound")
             new_game_events.append(map_game_to_event(game, game_number, round_name))
-        else:
-            bdl_status = game.get("status", "")
-            period = game.get("period", 0)
-            db_status = existing.get("status", STATUS_UPCOMING)
-            update_data: dict = {}
-
-            if bdl_status == "Final" and db_status != STATUS_RESOLVED:
-                update_data = {
-                    "status": STATUS_RESOLVED,
-                    "team1Score": game.get("home_team_score", 0) or 0,
-                    "team2Score": game.get("visitor_team_score", 0) or 0,
-                }
-                resolved_event_states[existing["id"]] = {**existing, **update_data}
-            elif period > 0 and bdl_status != "Final" and db_status == STATUS_UPCOMING:
-                update_data = {
-                    "status": STATUS_IN_PROGRESS,
-                    "team1Score": game.get("home_team_score", 0) or 0,
-                    "team2Score": game.get("visitor_team_score", 0) or 0,
-                }
-
-            if update_data:
-                update_event(supabase, existing["id"], update_data)
-                game_updated += 1
+        elif game.id not in transitions_checked:
+            # Cached games outside the incremental window were not streamed.
+            _check_transition(game, existing)
 
     inserted_games: list[dict] = []
     if new_game_events:
-        inserted_games = insert_events(supabase, new_game_events)
+        inserted_games = await db.insert_events(new_game_events)
         for ev in inserted_games:
             if ev.get("parentEvent"):
                 existing_by_parse[str(ev["parentEvent"])] = ev
 
     _step(3, "Sync game events",
-          f"+{len(inserted_games)} new · {game_updated} updated")
+          f"+{len(inserted_games)} new · {game_updated} updated · {game_skipped} unchanged")
 
     # ------------------------------------------------------------------
     # Step 4: Sync series-level events (play-in has no series)
     # ------------------------------------------------------------------
-    non_playin_games = [
-        g for g in bdl_games
-        if detect_round(g.get("datetime") or g.get("date", "")) != "playin"
-    ]
-    new_series, series_updates = build_series_events(non_playin_games, existing_by_parse)
+    new_series, series_updates = build_series_events(bdl_games, existing_by_parse, matchups)
 
     inserted_series: list[dict] = []
     if new_series:
-        inserted_series = insert_events(supabase, new_series)
+        inserted_series = await db.insert_events(new_series)
         for ev in inserted_series:
             if ev.get("parentEvent"):
                 existing_by_parse[str(ev["parentEvent"])] = ev
 
+    series_updated = 0
+    series_skipped = 0
+    # Updates are keyed by the stored row's id, which need not equal its parentEvent.
+    existing_by_id = {e["id"]: e for e in existing_by_parse.values() if e.get("id")}
     for event_id, update_data in series_updates:
-        update_event(supabase, event_id, update_data)
+        existing_series = existing_by_id.get(event_id)
+        if existing_series is None:
+            continue
+        changes = diff_event_update(existing_series, update_data)
+        if not changes:
+            series_skipped += 1
+            continue
+        event_updates.append((existing_series, changes))
+        series_updated += 1
+        # Re-score a resolved series whenever its stored row changes.
         if update_data.get("status") == STATUS_RESOLVED:
-            existing_series = existing_by_parse.get(event_id)
-            if existing_series:
-                resolved_event_states[event_id] = {**existing_series, **update_data}
+            resolved_event_states[event_id] = {**existing_series, **update_data}
 
     # Special events: finalsChampion deadline anchor + finalsMvp (once conference finals resolve)
-    new_special, special_updates = build_special_events(bdl_games, existing_by_parse)
+    new_special, special_updates = build_special_events(bdl_games, existing_by_parse, matchups)
     inserted_special: list[dict] = []
     if new_special:
-        inserted_special = insert_events(supabase, new_special)
+        inserted_special = await db.insert_events(new_special)
         for ev in inserted_special:
             if ev.get("parentEvent"):
                 existing_by_parse[str(ev["parentEvent"])] = ev
+    existing_by_id = {e["id"]: e for e in existing_by_parse.values() if e.get("id")}
     for event_id, update_data in special_updates:
-        update_event(supabase, event_id, update_data)
+        existing_special = existing_by_id.get(event_id)
+        if existing_special is None:
+            continue
+        changes = diff_event_update(existing_special, update_data)
+        if changes:
+            event_updates.append((existing_special, changes))
+        else:
+            series_skipped += 1
+
+    _, write_failures = await db.update_events(event_updates)
+    if state is not None:
+        state.apply_event_updates(event_updates, (event_id for event_id, _ in write_failures))
+    for event_id, _ in write_failures:
+        # Status not persisted — leave scoring to the run that writes it.
+        resolved_event_states.pop(event_id, None)
 
     special_summary = f" · +{len(inserted_special)} special" if inserted_special else ""
+    failed_summary = f" · {len(write_failures)} writes failed" if write_failures else ""
     _step(4, "Sync series events",
-          f"+{len(inserted_series)} new · {len(series_updates)} updated{special_summary}")
+          f"+{len(inserted_series)} new · {series_updated} updated · "
+          f"{series_skipped} unchanged{special_summary}{failed_summary}")
+    for event_id, error in write_failures:
+        _detail(f"{event_id}: {error[:200]}")
+
+    # Plan the next useful run from the events as they now stand.
+    changes_by_id = {stored["id"]: changes for stored, changes in event_updates}
+    next_wake = plan_wakeups(
+        ({**ev, **changes_by_id.get(ev.get("id"), {})} for ev in existing_by_parse.values()),
+        started_at,
+    )["next_wake"]
 
     # ------------------------------------------------------------------
     # Step 5: Create bets for newly added events
@@ -248,79 +483,67 @@ async def sync_all() -> dict:
             "events_created": len(inserted_games),
             "events_updated": game_updated,
             "series_created": len(inserted_series),
-            "series_updated": len(series_updates),
+            "series_updated": series_updated,
+            "updates_skipped": game_skipped + series_skipped,
+            "update_failures": len(write_failures),
             "bets_created": 0,
             "bets_scored": 0,
+            "games_live": len(live_game_ids),
+            "live_game_ids": live_game_ids,
+            "next_start": next_start,
+            "next_wake": next_wake,
         }
 
-    all_user_ids = fetch_all_user_ids(supabase)
+    all_user_ids = snapshot["user_ids"]
     # Restrict to specific users when TARGET_USER_IDS is set (preview / test mode).
     target_ids = TARGET_USER_IDS if TARGET_USER_IDS else all_user_ids
 
     # All current-season events (existing + newly inserted) that target users may be missing bets on.
     all_current_events = list(existing_by_parse.values())
 
-    bet_rows: list[dict] = []
-    for ev in all_current_events:
-        ev_id = ev.get("id")
-        if not ev_id or not _should_create_bet(ev):
-            continue
-        for user_id in target_ids:
-            if (ev_id, str(user_id)) not in existing_bet_pairs:
-                bet_rows.append({
-                "eventId": ev["id"],
-                "userId": user_id,
-                "closeTime": ev.get("startTime"),
-                "eventType": ev.get("eventType"),
-                "calcFunc": ev.get("round"),
-            })
-
-    bets_created = insert_bets(supabase, bet_rows)
+    # With BET_INSERT_ON_CONFLICT the pair index is empty, so every event × user
+    # row is offered and the database skips the ones that already exist.
+    bet_rows = _missing_bet_rows(all_current_events, target_ids, existing_bet_pairs)
+    if state is not None:
+        # Keep the resident index current. If an insert fails the run raises,
+        # and the caller invalidates the store.
+        bet_rows = _recorded(bet_rows, existing_bet_pairs)
+    bets_created, bets_offered = await db.insert_bets_chunked(
+        bet_rows, skip_conflicts=BET_INSERT_ON_CONFLICT,
+    )
+    bets_skipped = bets_offered - bets_created
     user_label = f"{len(target_ids)} users" + (" [restricted]" if TARGET_USER_IDS else "")
     bets_summary = f"+{bets_created} bets ({user_label})" if bets_created else "—"
+    if BET_INSERT_ON_CONFLICT:
+        bets_summary = f"+{bets_created} bets ({user_label}) · {bets_skipped} already existed"
     _step(5, "Create bets", bets_summary)
 
     # ------------------------------------------------------------------
     # Step 6: Score resolved events
     # ------------------------------------------------------------------
-    bets_scored = 0
-    events_scored = 0
-
     # Include events that were already resolved in a previous run but still
     # have unscored bets (e.g. bets created after the event resolved).
-    for skipped_id in fetch_unscored_resolved_event_ids(supabase):
+    for skipped_id in await db.fetch_unscored_resolved_event_ids():
         if skipped_id not in resolved_event_states:
             event_state = existing_by_parse.get(skipped_id)
             if event_state:
                 resolved_event_states[skipped_id] = event_state
 
-    for event_id, event_state in resolved_event_states.items():
-        all_bets = fetch_event_bets(supabase, event_id)
-        placed_bets = [b for b in all_bets if b.get("winnerTeam") is not None]
-
-        if not placed_bets:
-            continue
-
-        point_updates = [
-            (
-                bet["id"],
-                {
-                    "pointsGained": pts,
-                    "pointsGainedWinMargin": pts_margin,
-                },
-            )
-            for bet in placed_bets
-            for pts, pts_margin in [calculate_points(bet, event_state, all_bets)]
-        ]
-
-        update_bets_points(supabase, point_updates)
-        bets_scored += len(point_updates)
-        events_scored += 1
+    score_results = await score_resolved_events(db, resolved_event_states)
+    scored_results = [r for r in score_results if r["bets_scored"]]
+    bets_scored = sum(r["bets_scored"] for r in scored_results)
+    events_scored = len(scored_results)
 
     score_summary = (
         f"{bets_scored} bets scored ({events_scored} events)" if bets_scored else "—"
     )
     _step(6, "Score resolved bets", score_summary)
+    for result in scored_results:
+        _detail(
+            f"{result['event_id']}: {result['bets_scored']} bets · "
+            f"fetch {result['fetch_s']:.2f}s · score {result['score_s']:.2f}s · "
+            f"write {result['write_s']:.2f}s"
+        )
 
     _footer(time.monotonic() - start)
 
@@ -329,7 +552,13 @@ async def sync_all() -> dict:
         "events_created": len(inserted_games),
         "events_updated": game_updated,
         "series_created": len(inserted_series),
-        "series_updated": len(series_updates),
+        "series_updated": series_updated,
+        "updates_skipped": game_skipped + series_skipped,
+        "update_failures": len(write_failures),
         "bets_created": bets_created,
         "bets_scored": bets_scored,
+        "games_live": len(live_game_ids),
+        "live_game_ids": live_game_ids,
+        "next_start": next_start,
+        "next_wake": next_wake,
     }
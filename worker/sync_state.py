@@ -0,0 +1,99 @@
+"""
+Local sync state for incremental runs.
+
+The state file caches every BallDontLie game seen so far plus a watermark (the
+time of the last successful fetch):
+
+    {"watermark": "2026-05-02T10:00:00+00:00", "games": {"<bdl id>": {...}}}
+
+Incremental runs only re-fetch a rolling date window and merge it into the
+cache, so Steps 3 and 4 still see the full postseason game list.
+"""
+import json
+import os
+from datetime import date, timedelta
+
+from bdl_client import PLAYOFFS_START_DATE
+from config import SYNC_STATE_PATH, SYNC_LOOKBACK_DAYS, SYNC_LOOKAHEAD_DAYS
+
+
+def load_sync_state(path=SYNC_STATE_PATH) -> dict:
+    """Return the saved state, or an empty state if the file is missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {"watermark": None, "games": {}}
+    return {"watermark": state.get("watermark"), "games": state.get("games") or {}}
+
+
+def save_sync_state(state: dict, path=SYNC_STATE_PATH) -> None:
+    """Atomically write the state file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def incremental_window(
+    state: dict,
+    today: date,
+    lookback_days: int = SYNC_LOOKBACK_DAYS,
+    lookahead_days: int = SYNC_LOOKAHEAD_DAYS,
+) -> tuple[str, str] | None:
+    """
+    Return the (start_date, end_date) window to re-fetch, or None if a full
+    fetch is needed (no cached games or no watermark yet).
+
+    The window covers [today - lookback_days, today + lookahead_days], reaches
+    back to the day before the watermark if the worker has not run for a
+    while, and to the earliest past game that is still not Final.
+    """
+    games = state.get("games")
+    watermark = state.get("watermark")
+    if not games or not watermark:
+        return None
+
+    start = min(
+        today - timedelta(days=lookback_days),
+        date.fromisoformat(watermark[:10]) - timedelta(days=1),
+    )
+    stale = [
+        game_date
+        for g in games.values()
+        if g.get("status") != "Final" and (game_date := _game_date(g)) and game_date < start
+    ]
+    if stale:
+        start = min(stale)
+    start = max(start, date.fromisoformat(PLAYOFFS_START_DATE))
+    end = today + timedelta(days=lookahead_days)
+    return start.isoformat(), end.isoformat()
+
+
+def merge_window_games(
+    cached_games: dict[str, dict],
+    fetched: list[dict],
+    window: tuple[str, str],
+) -> dict[str, dict]:
+    """
+    Replace the cached games inside window with the freshly fetched ones.
+
+    The fetch is authoritative for its window, so cached games in the window
+    that BallDontLie no longer returns are dropped.
+    """
+    start, end = (date.fromisoformat(d) for d in window)
+    merged = {
+        game_id: g
+        for game_id, g in cached_games.items()
+        if not (game_date := _game_date(g)) or not start <= game_date <= end
+    }
+    merged.update((str(g["id"]), g) for g in fetched)
+    return merged
+
+
+def _game_date(game: dict) -> date | None:
+    """The BDL game date (Eastern), which is what start_date / end_date filter on."""
+    try:
+        return date.fromisoformat((game.get("date") or "")[:10])
+    except ValueError:
+        return None
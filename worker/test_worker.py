@@ -6,11 +6,42 @@ Run from the worker/ directory:
 """
 import sys
 import os
+import asyncio
+import inspect
+import math
+from datetime import date, datetime, timezone
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
 
 # Ensure the worker directory is on the path so imports resolve
 sys.path.insert(0, os.path.dirname(__file__))
 
 
+import async_db
+import daemon
+import models
+import planner
+import scoring_numpy
+import sqlite_store
+import supabase_client
+import sync
+from async_db import BACKEND_FUNCTIONS, AsyncSupabase
+from bdl_cache import ResponseCache
+from bdl_client import (
+    PLAYOFFS_START_DATE,
+    BdlBudgetExceeded,
+    BdlClient,
+    TokenBucket,
+    date_partitions,
+    fetch_bdl_games,
+    page_cache_ttl,
+    stream_bdl_games,
+)
+from bet_index import BetPairIndex
+from daemon import failure_interval, next_interval
+from live_scores import refresh_live_scores
 from models import (
     detect_round,
     detect_event_type,
@@ -19,9 +50,36 @@ from models import (
     build_series_events,
     build_special_events,
     calculate_points,
+    score_event,
+    diff_event_update,
+    Game,
+    MatchupIndex,
+    _RoundIndex,
+    game_event_update,
+)
+from planner import plan_wakeups
+from scoring import score_resolved_events
+from state_store import StateStore
+from supabase_client import (
+    fetch_existing_bet_pairs,
+    insert_bets,
+    iter_event_bets,
+    update_bets_points,
+    update_events,
+)
+from sync import _missing_bet_rows, _should_create_bet, load_snapshot
+from sync_state import incremental_window, load_sync_state, merge_window_games, save_sync_state
+from config import (
+    STATUS_UPCOMING,
+    STATUS_IN_PROGRESS,
+    STATUS_RESOLVED,
+    APP_SEASON,
+    BDL_CACHE_PAST_TTL_S,
+    BDL_CACHE_TTL_S,
+    DAEMON_IDLE_INTERVAL_S,
+    DAEMON_LIVE_INTERVAL_S,
+    DAEMON_PREGAME_LEAD_S,
 )
-from sync import _should_create_bet
-from config import STATUS_UPCOMING, STATUS_IN_PROGRESS, STATUS_RESOLVED
 
 
 # ---------------------------------------------------------------------------
@@ -99,6 +157,20 @@ class TestDetectRound:
     def test_empty_string_falls_back(self):
         assert detect_round("") == "firstRound"
 
+    def test_non_iso_timestamps_use_the_dateutil_fallback(self):
+        assert detect_round("May 10 2026 8:00 PM") == "secondRound"
+
+    def test_date_only_strings(self):
+        assert detect_round("2026-05-20") == "conference"
+
+    def test_gap_between_ranges_falls_back_to_first_round(self):
+        index = _RoundIndex([("playin", "2026-04-14", "2026-04-17"), ("finals", "2026-06-03", "2026-06-22")])
+        assert index.lookup(date(2026, 4, 16)) == "playin"
+        assert index.lookup(date(2026, 5, 1)) == "firstRound"
+        assert index.lookup(date(2026, 6, 3)) == "finals"
+        assert index.lookup(date(2026, 4, 1)) == "playin"
+        assert index.lookup(date(2026, 7, 1)) == "finals"
+
 
 # ---------------------------------------------------------------------------
 # Event type detection tests
@@ -387,6 +459,92 @@ class TestBuildSeriesEvents:
         assert new_series[0]["id"] == "series_Celtics_Warriors"
 
 
+class TestGameRecord:
+    def test_from_bdl_parses_once(self):
+        raw = make_game(7, "Lakers", "Celtics", "2026-05-10T23:00:00.000Z",
+                        status="Final", period=4, home_score=99, visitor_score=101)
+        game = Game.from_bdl(raw)
+
+        assert (game.id, game.home, game.visitor) == (7, "Lakers", "Celtics")
+        assert game.start == "2026-05-10T23:00:00.000Z"
+        assert game.dated_round == "secondRound"
+        assert game.final and game.winner == "Celtics"
+        assert game.matchup_key == ("Celtics", "Lakers")
+        assert map_game_to_event(game, 2, "secondRound") == map_game_to_event(raw, 2, "secondRound")
+
+    def test_missing_scores_and_datetime_default(self):
+        raw = {**make_game(8, "Heat", "Bulls", "2026-04-15T23:00:00Z"),
+               "datetime": None, "home_team_score": None, "visitor_team_score": None}
+        game = Game.from_bdl(raw)
+        assert game.start == "2026-04-15"
+        assert (game.home_score, game.visitor_score) == (0, 0)
+
+
+class TestMatchupIndex:
+    def _games(self):
+        return [
+            # Play-in meeting, then the same teams in the conference finals
+            make_game(1, "Heat", "Hawks", "2026-04-15T23:00:00.000Z",
+                      status="Final", period=4, home_score=100, visitor_score=90),
+            make_game(2, "Hawks", "Heat", "2026-05-22T00:00:00.000Z",
+                      status="Final", period=4, home_score=110, visitor_score=100),
+            make_game(3, "Heat", "Hawks", "2026-05-24T00:00:00.000Z"),
+            make_game(4, "Celtics", "Lakers", "2026-04-20T23:00:00.000Z"),
+        ]
+
+    def test_shared_index_matches_standalone_builders(self):
+        games = self._games()
+        index = MatchupIndex(games)
+        assert (index.game_numbers, index.game_rounds) == compute_game_numbers(games)
+        assert build_series_events(games, {}, index) == build_series_events(games, {})
+        assert build_special_events(games, {}, index) == build_special_events(games, {})
+
+    def test_playin_games_are_left_out_of_the_series(self):
+        matchup = MatchupIndex(self._games()).matchups[("Hawks", "Heat")]
+        assert [g.id for g in matchup.games] == [1, 2, 3]
+        assert [g.id for g in matchup.series_games] == [2, 3]
+        assert matchup.series_round == "conference"
+        assert (matchup.team1, matchup.team1_wins, matchup.team2_wins) == ("Hawks", 1, 0)
+        assert matchup.start_time == "2026-05-22T00:00:00.000Z"
+
+    def test_round_starts_use_each_games_own_date(self):
+        starts = MatchupIndex(self._games()).round_starts
+        assert starts["playin"] == "2026-04-15T23:00:00.000Z"
+        assert starts["firstRound"] == "2026-04-20T23:00:00.000Z"
+
+
+class TestDiffEventUpdate:
+    def _stored(self) -> dict:
+        return {
+            "id": "series_Celtics_Lakers",
+            "team1Score": 2,
+            "team2Score": 1,
+            "status": STATUS_IN_PROGRESS,
+            "gameNumber": 3,
+            "startTime": "2026-04-20T23:00:00+00:00",
+        }
+
+    def test_unchanged_series_update_is_dropped(self):
+        games = [
+            make_game(100 + i, "Celtics", "Lakers", f"2026-04-{20 + i * 2}T23:00:00.000Z",
+                      status="Final", period=4,
+                      home_score=110 if i < 2 else 90, visitor_score=100)
+            for i in range(3)
+        ]
+        _, updates = build_series_events(games, {"series_Celtics_Lakers": self._stored()})
+        _, update_data = updates[0]
+        # BDL ".000Z" vs Supabase "+00:00" for the same instant is not a change
+        assert diff_event_update(self._stored(), update_data) == {}
+
+    def test_only_changed_fields_are_returned(self):
+        update = {"team1Score": 3, "team2Score": 1, "status": STATUS_IN_PROGRESS, "gameNumber": 4}
+        assert diff_event_update(self._stored(), update) == {"team1Score": 3, "gameNumber": 4}
+
+    def test_moved_start_time_is_a_change(self):
+        update = {"startTime": "2026-04-21T00:30:00.000Z"}
+        assert diff_event_update(self._stored(), update) == update
+
+
 # ---------------------------------------------------------------------------
 # Helpers for calculate_points tests
 # ---------------------------------------------------------------------------
@@ -561,6 +719,81 @@ class TestCalculatePointsSeries:
         assert margin == 0
 
 
+class TestScoreEvent:
+    """score_event must agree with calculate_points bet-for-bet."""
+
+    def _bets(self) -> list[dict]:
+        margins = [None, 1, 4, 6, 6, 9, 12, 20]
+        bets = [make_bet("Celtics", m, f"c{i}") for i, m in enumerate(margins)]
+        bets += [make_bet("Lakers", m, f"l{i}") for i, m in enumerate(margins)]
+        bets.append(make_bet(None, None, "unplaced"))
+        return bets
+
+    def test_game_matches_calculate_points(self):
+        event = make_event("Celtics", "Lakers", 110, 104, event_type="game", round_name="finals")
+        bets = self._bets()
+        assert score_event(event, bets) == [calculate_points(b, event, bets) for b in bets]
+
+    def test_playin_matches_calculate_points(self):
+        event = make_event("Lakers", "Celtics", 99, 105, event_type="playin", round_name="playin")
+        bets = self._bets()
+        assert score_event(event, bets) == [calculate_points(b, event, bets) for b in bets]
+
+    def test_series_matches_calculate_points(self):
+        event = make_event("Celtics", "Lakers", 4, 2, event_type="series", game_number=6)
+        bets = self._bets()
+        assert score_event(event, bets) == [calculate_points(b, event, bets) for b in bets]
+
+    def test_closest_margin_awarded_once_per_event(self):
+        event = make_event("Celtics", "Lakers", 110, 100, event_type="game", round_name="conference")
+        bets = [make_bet("Celtics", 8, "b1"), make_bet("Celtics", 12, "b2"), make_bet("Celtics", 15, "b3")]
+        assert score_event(event, bets) == [(2, 1), (2, 1), (2, 0)]
+
+    def test_unknown_event_type_scores_zero(self):
+        event = make_event("Celtics", "Lakers", 1, 0, event_type="finalsMvp")
+        assert score_event(event, [make_bet("Celtics", 1)]) == [(0, 0)]
+
+
+class TestScoreEventVectorized:
+    """The NumPy backend must give exactly the pure-Python results."""
+
+    def _check(self, event: dict, bets: list[dict]) -> None:
+        expected = [calculate_points(b, event, bets) for b in bets]
+        assert scoring_numpy.score_event_vectorized(event, bets) == expected
+
+    def setup_method(self):
+        pytest.importorskip("numpy")
+
+    def test_game_events_match(self):
+        bets = TestScoreEvent()._bets()
+        for round_name in ("playin", "conference", "finals"):
+            self._check(make_event("Celtics", "Lakers", 110, 104, round_name=round_name), bets)
+            self._check(make_event("Celtics", "Lakers", 90, 110, round_name=round_name), bets)
+
+    def test_series_events_match(self):
+        bets = TestScoreEvent()._bets()
+        for round_name in ("firstRound", "secondRound", "conference", "finals"):
+            for games in (4, 6, 7):
+                self._check(make_event("Celtics", "Lakers", 4, games - 4, event_type="series",
+                                       round_name=round_name, game_number=games), bets)
+
+    def test_no_correct_margin_bets(self):
+        event = make_event("Celtics", "Lakers", 110, 104, round_name="finals")
+        self._check(event, [make_bet("Celtics", None, "b1"), make_bet("Lakers", 6, "b2")])
+
+    def test_score_event_switches_backend_at_threshold(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(models, "VECTOR_SCORING_MIN_BETS", 3)
+        monkeypatch.setattr(
+            scoring_numpy, "score_event_vectorized",
+            lambda event, bets: calls.append(len(bets)) or [(0, 0)] * len(bets),
+        )
+        event = make_event("Celtics", "Lakers", 110, 104, round_name="finals")
+        score_event(event, [make_bet("Celtics", 6)] * 2)
+        score_event(event, [make_bet("Celtics", 6)] * 3)
+        assert calls == [3]
+
+
 # ---------------------------------------------------------------------------
 # _should_create_bet tests
 # ---------------------------------------------------------------------------
@@ -661,7 +894,6 @@ class TestBuildSpecialEvents:
         assert fc["startTime"] == "2026-04-20T20:00:00.000Z"
 
     def test_finals_mvp_created_when_conference_resolved_and_finals_scheduled(self):
-        from config import STATUS_RESOLVED
         existing = {
             "series_Celtics_Heat": make_series_event("Celtics", "Heat", 4, 2, "conference", STATUS_RESOLVED),
             "series_Lakers_Warriors": make_series_event("Lakers", "Warriors", 4, 1, "conference", STATUS_RESOLVED),
@@ -676,7 +908,6 @@ class TestBuildSpecialEvents:
         assert "Lakers" in (mvp["team1"], mvp["team2"])
 
     def test_finals_mvp_not_created_before_conference_resolves(self):
-        from config import STATUS_IN_PROGRESS
         existing = {
             "series_Celtics_Heat": make_series_event("Celtics", "Heat", 3, 2, "conference", STATUS_IN_PROGRESS),
         }
@@ -685,7 +916,6 @@ class TestBuildSpecialEvents:
         assert not any(e["id"] == "finalsMvp" for e in new_events)
 
     def test_finals_mvp_not_created_without_finals_games(self):
-        from config import STATUS_RESOLVED
         existing = {
             "series_Celtics_Heat": make_series_event("Celtics", "Heat", 4, 2, "conference", STATUS_RESOLVED),
             "series_Lakers_Warriors": make_series_event("Lakers", "Warriors", 4, 1, "conference", STATUS_RESOLVED),
@@ -696,7 +926,6 @@ class TestBuildSpecialEvents:
         assert not any(e["id"] == "finalsMvp" for e in new_events)
 
     def test_finals_mvp_not_duplicated_when_already_exists(self):
-        from config import STATUS_RESOLVED
         existing = {
             "series_Celtics_Heat": make_series_event("Celtics", "Heat", 4, 2, "conference", STATUS_RESOLVED),
             "series_Lakers_Warriors": make_series_event("Lakers", "Warriors", 4, 1, "conference", STATUS_RESOLVED),
@@ -705,3 +934,1210 @@ class TestBuildSpecialEvents:
         games = [make_game(300, "Celtics", "Lakers", "2026-06-05T01:00:00.000Z")]
         new_events, _ = build_special_events(games, existing)
         assert not any(e["id"] == "finalsMvp" for e in new_events)
+
+
+# ---------------------------------------------------------------------------
+# Supabase write helpers
+# ---------------------------------------------------------------------------
+
+class _FakeQuery:
+    """Records a chained supabase-py query and returns canned rows on execute()."""
+
+    def __init__(self, log: list, table: str, rows: list[dict], fail_when=None, max_rows=None):
+        self.log = log
+        self.rows = rows
+        self.fail_when = fail_when
+        self.max_rows = max_rows
+        self.call = {"table": table, "filters": []}
+
+    def update(self, data):
+        self.call.update(op="update", data=data)
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False):
+        self.call.update(op="upsert", data=rows, on_conflict=on_conflict,
+                         ignore_duplicates=ignore_duplicates)
+        return self
+
+    def select(self, columns, count=None):
+        self.call.update(op="select", columns=columns, count=count)
+        return self
+
+    @property
+    def not_(self):
+        return self
+
+    def is_(self, column, value):
+        self.call["filters"].append(("is", column, value))
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.call["range"] = (start, end)
+        return self
+
+    def limit(self, n):
+        self.call["limit"] = n
+        return self
+
+    def gt(self, column, value):
+        self.call["filters"].append(("gt", column, value))
+        return self
+
+    def in_(self, column, values):
+        self.call["filters"].append(("in", column, list(values)))
+        return self
+
+    def eq(self, column, value):
+        self.call["filters"].append(("eq", column, value))
+        return self
+
+    def execute(self):
+        self.log.append(self.call)
+        if self.fail_when and self.fail_when(self.call):
+            raise APIError({"message": "rejected"})
+        rows = self.rows
+        count = len(rows) if self.call.get("count") else None
+        for op, column, value in self.call["filters"]:
+            if op == "gt":
+                rows = [r for r in rows if r[column] > value]
+        if "range" in self.call:
+            start, end = self.call["range"]
+            rows = rows[start:end + 1]
+        if "limit" in self.call:
+            rows = rows[:self.call["limit"]]
+        rows = rows[:self.max_rows]
+        data = rows if self.call["op"] == "select" else []
+        return type("Response", (), {"data": data, "count": count})()
+
+
+class FakeSupabase:
+    def __init__(self, rows: dict[str, list[dict]] | None = None, fail_when=None, max_rows=None):
+        self.calls: list[dict] = []
+        self.rows = rows or {}
+        self.fail_when = fail_when
+        self.max_rows = max_rows
+
+    def table(self, name: str) -> _FakeQuery:
+        return _FakeQuery(self.calls, name, self.rows.get(name, []), self.fail_when, self.max_rows)
+
+    def rpc(self, fn: str, params: dict) -> _FakeQuery:
+        query = _FakeQuery(self.calls, None, [], self.fail_when, self.max_rows)
+        query.call.update(op="rpc", fn=fn, params=params)
+        return query
+
+
+class TestUpdateBetsPoints:
+    def test_groups_bets_by_points_and_chunks_ids(self):
+        supabase = FakeSupabase()
+        updates = [
+            (f"b{i}", {"pointsGained": 2 if i % 2 else 0, "pointsGainedWinMargin": 0})
+            for i in range(5)
+        ]
+        written = update_bets_points(supabase, updates, chunk_size=2)
+
+        assert written == 5
+        # 3 bets with 0 points → 2 chunks; 2 bets with 2 points → 1 chunk
+        assert len(supabase.calls) == 3
+        assert all(c["op"] == "update" for c in supabase.calls)
+        ids = sorted(i for c in supabase.calls for i in c["filters"][0][2])
+        assert ids == ["b0", "b1", "b2", "b3", "b4"]
+
+    def test_empty_updates_send_nothing(self):
+        supabase = FakeSupabase()
+        assert update_bets_points(supabase, []) == 0
+        assert supabase.calls == []
+
+    def test_failed_chunk_is_retried(self, monkeypatch):
+        monkeypatch.setattr(supabase_client.time, "sleep", lambda _s: None)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise APIError({"message": "timeout"})
+            return "ok"
+
+        assert supabase_client._execute_with_retry(flaky, attempts=3) == "ok"
+        assert len(attempts) == 3
+
+
+class TestUpdateEvents:
+    def _stored(self, event_id: str) -> dict:
+        return {
+            "id": event_id, "team1": "Celtics", "team2": "Lakers", "team1Score": 0,
+            "team2Score": 0, "status": STATUS_UPCOMING, "created_at": "2026-04-01T00:00:00+00:00",
+        }
+
+    def test_changed_columns_of_each_row_go_out_in_one_call_per_chunk(self):
+        supabase = FakeSupabase()
+        updates = [(self._stored(f"e{i}"), {"team1Score": 100 + i}) for i in range(4)]
+        updates.append((self._stored("final"), {"team2Score": 98, "status": STATUS_RESOLVED}))
+        updates.append((self._stored("unchanged"), {}))
+
+        written, failures = update_events(supabase, updates, chunk_size=3)
+
+        assert (written, failures) == (5, [])
+        assert [(c["op"], c["fn"]) for c in supabase.calls] == [("rpc", "bulk_update_events")] * 2
+        assert [c["params"]["rows"] for c in supabase.calls] == [
+            [{"id": "e0", "team1Score": 100}, {"id": "e1", "team1Score": 101}, {"id": "e2", "team1Score": 102}],
+            [{"id": "e3", "team1Score": 103}, {"id": "final", "team2Score": 98, "status": STATUS_RESOLVED}],
+        ]
+
+    def test_failed_chunk_reports_bad_rows_only(self, monkeypatch):
+        monkeypatch.setattr(supabase_client.time, "sleep", lambda _s: None)
+
+        def reject_e1(call):
+            if call["op"] == "rpc":
+                return any(row["id"] == "e1" for row in call["params"]["rows"])
+            return ("eq", "id", "e1") in call["filters"]
+
+        supabase = FakeSupabase(fail_when=reject_e1)
+        updates = [(self._stored(f"e{i}"), {"team1Score": i}) for i in range(3)]
+
+        written, failures = supabase_client.update_events(supabase, updates)
+
+        assert written == 2
+        assert [event_id for event_id, _ in failures] == ["e1"]
+        # the chunk is retried, then each row is written with its own changes
+        fallback = [c for c in supabase.calls if c["op"] == "update"]
+        assert [(c["data"], c["filters"]) for c in fallback] == [
+            ({"team1Score": i}, [("eq", "id", f"e{i}")]) for i in range(3)
+        ]
+
+
+class TestBetPairIndex:
+    def test_membership_and_counts(self):
+        index = BetPairIndex([("e1", "u1"), ("e1", "u2"), ("e2", "u2"), ("e1", "u1")])
+
+        assert ("e1", "u1") in index
+        assert ("e2", "u2") in index
+        assert ("e2", "u1") not in index
+        assert ("e3", "u1") not in index
+        assert ("e1", "unknown") not in index
+        assert len(index) == 3  # duplicate pair counted once
+        assert index.event_count() == 2
+
+    def test_user_ids_are_compared_as_strings(self):
+        index = BetPairIndex([("e1", 42)])
+        assert ("e1", "42") in index
+
+    def test_fetch_pages_through_all_bet_rows(self):
+        rows = [{"id": i, "eventId": f"e{i % 3}", "userId": f"u{i}"} for i in range(7)]
+        supabase = FakeSupabase({"bets": rows})
+
+        index = fetch_existing_bet_pairs(supabase, page_size=3)
+
+        assert len(index) == 7
+        assert ("e1", "u4") in index
+        # keyset pages; only the first one pays for the exact count
+        assert [[f for f in c["filters"] if f[0] == "gt"] for c in supabase.calls] == [
+            [], [("gt", "id", 2)], [("gt", "id", 5)],
+        ]
+        assert [c["count"] is not None for c in supabase.calls] == [True, False, False]
+        assert all(c["limit"] == 3 and "range" not in c for c in supabase.calls)
+
+    def test_fetch_fails_when_rows_are_missing(self):
+        rows = [{"id": i, "eventId": "e1", "userId": f"u{i}"} for i in range(5)]
+        # Server caps responses at 2 rows while we ask for 3 → paging stops early
+        supabase = FakeSupabase({"bets": rows}, max_rows=2)
+        with pytest.raises(RuntimeError):
+            fetch_existing_bet_pairs(supabase, page_size=3)
+
+
+class TestInsertBetsSkipConflicts:
+    def test_conflicting_pairs_are_left_to_the_database(self):
+        supabase = FakeSupabase()
+        rows = [{"eventId": "e1", "userId": "u1"}, {"eventId": "e1", "userId": "u2"}]
+        insert_bets(supabase, rows, skip_conflicts=True)
+
+        call = supabase.calls[0]
+        assert call["op"] == "upsert"
+        assert call["on_conflict"] == "eventId,userId"
+        assert call["ignore_duplicates"] is True
+
+
+class TestIterEventBets:
+    def _rows(self) -> list[dict]:
+        # Already ordered by eventId, id — as the query requests
+        return (
+            [{"id": f"a{i}", "eventId": "e1", "winnerTeam": "Celtics"} for i in range(3)]
+            + [{"id": f"b{i}", "eventId": "e2", "winnerTeam": "Lakers"} for i in range(2)]
+        )
+
+    def test_groups_rows_by_event_across_pages(self):
+        supabase = FakeSupabase({"bets": self._rows()})
+        groups = list(iter_event_bets(supabase, ["e1", "e2"], page_size=2))
+
+        assert [(eid, len(bets)) for eid, bets in groups] == [("e1", 3), ("e2", 2)]
+        # 5 rows at 2 per page → 3 pages, one query shape for all events
+        assert [c["range"] for c in supabase.calls] == [(0, 1), (2, 3), (4, 5)]
+        assert supabase.calls[0]["filters"][0] == ("in", "eventId", ["e1", "e2"])
+        assert "winnerTeam" in supabase.calls[0]["columns"]
+
+    def test_no_event_ids_sends_no_query(self):
+        supabase = FakeSupabase({"bets": self._rows()})
+        assert list(iter_event_bets(supabase, [])) == []
+        assert supabase.calls == []
+
+
+class TestInsertBetsChunked:
+    def _db(self, fail_on=None):
+        class RecordingDb(AsyncSupabase):
+            def __init__(self):
+                super().__init__(FakeSupabase())
+                self.chunks: list[int] = []
+                self.in_flight = self.peak_in_flight = 0
+
+            async def insert_bets(self, bets, skip_conflicts=False):
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                await asyncio.sleep(0.001)
+                self.in_flight -= 1
+                if fail_on is not None and len(self.chunks) == fail_on:
+                    raise RuntimeError("insert failed")
+                self.chunks.append(len(bets))
+                return len(bets) - (1 if skip_conflicts else 0)
+
+        return RecordingDb()
+
+    def test_chunks_rows_with_bounded_concurrency(self):
+        db = self._db()
+        created, offered = asyncio.run(
+            db.insert_bets_chunked(({"n": i} for i in range(25)), chunk_size=4, max_in_flight=2)
+        )
+
+        assert (created, offered) == (25, 25)
+        assert sorted(db.chunks) == [1, 4, 4, 4, 4, 4, 4]
+        assert db.peak_in_flight <= 2
+
+    def test_rows_are_pulled_lazily(self):
+        pulled = []
+
+        def rows():
+            for i in range(100):
+                pulled.append(i)
+                yield {"n": i}
+
+        async def first_chunk_pull_count(db):
+            task = asyncio.create_task(db.insert_bets_chunked(rows(), chunk_size=5, max_in_flight=2))
+            await asyncio.sleep(0)
+            count = len(pulled)
+            await task
+            return count
+
+        assert asyncio.run(first_chunk_pull_count(self._db())) <= 10
+        assert len(pulled) == 100
+
+    def test_reports_skipped_conflicts(self):
+        db = self._db()
+        created, offered = asyncio.run(
+            db.insert_bets_chunked([{"n": i} for i in range(10)], skip_conflicts=True, chunk_size=5)
+        )
+        assert (created, offered) == (8, 10)
+
+    def test_failed_chunk_raises(self):
+        db = self._db(fail_on=1)
+        with pytest.raises(RuntimeError):
+            asyncio.run(db.insert_bets_chunked([{"n": i} for i in range(20)], chunk_size=5, max_in_flight=1))
+
+
+# ---------------------------------------------------------------------------
+# Pipeline helpers
+# ---------------------------------------------------------------------------
+
+class TestGameEventUpdate:
+    def test_transitions_and_live_scores(self):
+        game = make_game(1, "Celtics", "Lakers", "2026-05-08T23:00:00Z")
+        final = Game.from_bdl({**game, "status": "Final", "period": 4,
+                               "home_team_score": 110, "visitor_team_score": 99})
+        live = Game.from_bdl({**game, "status": "2nd Qtr", "period": 2,
+                              "home_team_score": 50, "visitor_team_score": 48})
+
+        assert game_event_update(final, {"status": 2}) == {
+            "status": STATUS_RESOLVED, "team1Score": 110, "team2Score": 99,
+        }
+        assert game_event_update(live, {"status": 1})["status"] == STATUS_IN_PROGRESS
+        assert game_event_update(live, {"status": 2}) == {"team1Score": 50, "team2Score": 48}
+        assert game_event_update(final, {"status": 3}) == {}
+
+
+class TestMissingBetRows:
+    def test_skips_existing_pairs_and_non_bettable_events(self):
+        existing = BetPairIndex()
+        existing.add("s1", "u1")
+        events = [
+            {"id": "s1", "eventType": "series", "round": "firstRound", "startTime": "t"},
+            {"id": "g1", "eventType": "game", "round": "firstRound", "startTime": "t"},
+            {"id": "g2", "eventType": "game", "round": "conference", "startTime": "t"},
+        ]
+
+        rows = list(_missing_bet_rows(events, ["u1", "u2"], existing))
+
+        assert [(r["eventId"], r["userId"]) for r in rows] == [("s1", "u2"), ("g2", "u1"), ("g2", "u2")]
+        assert rows[0]["calcFunc"] == "firstRound"
+
+
+class TestLoadSnapshot:
+    def _supabase(self) -> FakeSupabase:
+        return FakeSupabase({
+            "events": [{"id": "100", "parentEvent": "100"}],
+            "bets": [{"eventId": "100", "userId": "u1"}],
+            "users": [{"uuid": "u1"}, {"uuid": "u2"}],
+        })
+
+    def test_loads_all_parts_with_timings(self):
+        snapshot = asyncio.run(load_snapshot(AsyncSupabase(self._supabase())))
+
+        assert [e["id"] for e in snapshot["events"]] == ["100"]
+        assert ("100", "u1") in snapshot["bet_pairs"]
+        assert len(snapshot["bet_pairs"]) == 1
+        assert snapshot["user_ids"] == ["u1", "u2"]
+        assert set(snapshot["timings"]) == {"events", "bet_pairs", "user_ids"}
+
+    def test_users_skipped_when_not_needed(self):
+        supabase = self._supabase()
+        snapshot = asyncio.run(load_snapshot(AsyncSupabase(supabase), include_users=False))
+
+        assert snapshot["user_ids"] == []
+        assert "users" not in {c["table"] for c in supabase.calls}
+
+
+# ---------------------------------------------------------------------------
+# Scoring engine tests
+# ---------------------------------------------------------------------------
+
+class TestScoreResolvedEvents:
+    def test_scores_every_event_and_reports_timings(self):
+        # e2 has no placed bets, so the bulk query returns nothing for it
+        bet_rows = [
+            {**make_bet("Celtics", 10, "b1"), "eventId": "e1"},
+            {**make_bet("Lakers", 3, "b2"), "eventId": "e1"},
+        ]
+        supabase = FakeSupabase({"bets": bet_rows})
+        events = {
+            "e1": make_event("Celtics", "Lakers", 110, 100, round_name="conference"),
+            "e2": make_event("Celtics", "Lakers", 110, 100, round_name="conference"),
+        }
+
+        results = asyncio.run(
+            score_resolved_events(AsyncSupabase(supabase), events, max_concurrency=2)
+        )
+
+        by_id = {r["event_id"]: r for r in results}
+        assert by_id["e1"]["bets_scored"] == 2
+        assert by_id["e2"]["bets_scored"] == 0
+        assert all(r["fetch_s"] >= 0 and r["write_s"] >= 0 for r in results)
+        writes = {
+            bet_id: c["data"]
+            for c in supabase.calls if c["op"] == "update"
+            for bet_id in c["filters"][0][2]
+        }
+        assert writes["b1"] == {"pointsGained": 2, "pointsGainedWinMargin": 2}
+        assert writes["b2"] == {"pointsGained": 0, "pointsGainedWinMargin": 0}
+
+
+# ---------------------------------------------------------------------------
+# Incremental sync state tests
+# ---------------------------------------------------------------------------
+
+class TestIncrementalWindow:
+    def _state(self, *games: dict, watermark: str = "2026-05-10T10:00:00+00:00") -> dict:
+        return {"watermark": watermark, "games": {str(g["id"]): g for g in games}}
+
+    def test_no_state_needs_full_fetch(self):
+        assert incremental_window({"watermark": None, "games": {}}, date(2026, 5, 10)) is None
+
+    def test_rolling_window_around_today(self):
+        state = self._state(make_game(1, "Celtics", "Lakers", "2026-05-08T23:00:00Z", status="Final"))
+        window = incremental_window(state, date(2026, 5, 10), lookback_days=2, lookahead_days=7)
+        assert window == ("2026-05-08", "2026-05-17")
+
+    def test_window_reaches_back_to_old_watermark(self):
+        state = self._state(make_game(1, "Celtics", "Lakers", "2026-05-01T23:00:00Z", status="Final"),
+                            watermark="2026-05-03T10:00:00+00:00")
+        window = incremental_window(state, date(2026, 5, 10), lookback_days=2, lookahead_days=7)
+        assert window[0] == "2026-05-02"
+
+    def test_window_includes_stale_unfinished_game(self):
+        state = self._state(
+            make_game(1, "Celtics", "Lakers", "2026-04-25T23:00:00Z", status="7:00 pm ET"),
+            make_game(2, "Celtics", "Lakers", "2026-04-27T23:00:00Z", status="Final"),
+        )
+        window = incremental_window(state, date(2026, 5, 10), lookback_days=2, lookahead_days=7)
+        assert window[0] == "2026-04-25"
+
+    def test_merge_replaces_window_and_keeps_older_games(self):
+        old = make_game(1, "Celtics", "Lakers", "2026-04-20T23:00:00Z", status="Final")
+        stale = make_game(2, "Celtics", "Lakers", "2026-05-09T23:00:00Z")
+        dropped = make_game(3, "Heat", "Knicks", "2026-05-11T23:00:00Z")
+        fresh = make_game(2, "Celtics", "Lakers", "2026-05-09T23:00:00Z", status="Final")
+        cached = {str(g["id"]): g for g in (old, stale, dropped)}
+
+        merged = merge_window_games(cached, [fresh], ("2026-05-08", "2026-05-17"))
+
+        assert set(merged) == {"1", "2"}
+        assert merged["2"]["status"] == "Final"
+
+    def test_state_round_trip(self, tmp_path):
+        path = tmp_path / "state.json"
+        assert load_sync_state(path) == {"watermark": None, "games": {}}
+        state = self._state(make_game(1, "Celtics", "Lakers", "2026-05-08T23:00:00Z"))
+        save_sync_state(state, path)
+        assert load_sync_state(path) == state
+
+
+# ---------------------------------------------------------------------------
+# BallDontLie client
+# ---------------------------------------------------------------------------
+
+class TestBdlClient:
+    def _client(self, responses, **kwargs):
+        sleeps: list[float] = []
+        queue = list(responses)
+
+        def handler(request):
+            return queue.pop(0)
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        client = BdlClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            sleep=fake_sleep,
+            **{"requests_per_minute": 6000, "burst": 100, **kwargs},
+        )
+        return client, sleeps
+
+    def test_retries_429_honouring_retry_after(self):
+        bdl, sleeps = self._client([
+            httpx.Response(429, headers={"Retry-After": "7"}),
+            httpx.Response(200, json={"data": [1]}),
+        ])
+        body = asyncio.run(bdl.get("/games"))
+
+        assert body == {"data": [1]}
+        assert 7.0 in sleeps
+        assert bdl.stats["requests"] == 2
+
+    def test_retry_after_is_capped_at_backoff_max(self):
+        bdl, sleeps = self._client([
+            httpx.Response(429, headers={"Retry-After": "3600"}),
+            httpx.Response(200, json={"data": [1]}),
+        ], backoff_max_s=5)
+        asyncio.run(bdl.get("/games"))
+
+        assert 5.0 in sleeps
+        assert 3600.0 not in sleeps
+        assert bdl.stats["throttled"] == 1
+
+    def test_server_errors_back_off_with_jitter_then_raise(self):
+        bdl, sleeps = self._client(
+            [httpx.Response(503)] * 3, max_retries=2, backoff_base_s=1.0, backoff_max_s=10,
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(bdl.get("/games"))
+
+        assert bdl.stats["retries"] == 2
+        assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+
+    def test_client_errors_are_not_retried(self):
+        bdl, _ = self._client([httpx.Response(401)])
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(bdl.get("/games"))
+        assert bdl.stats["requests"] == 1
+
+    def test_request_budget_is_enforced(self):
+        bdl, _ = self._client([httpx.Response(503), httpx.Response(503)], request_budget=2)
+        with pytest.raises(BdlBudgetExceeded):
+            asyncio.run(bdl.get("/games"))
+        assert bdl.stats["requests"] == 2
+
+    def test_fetch_bdl_games_follows_cursor(self):
+        bdl, _ = self._client([
+            httpx.Response(200, json={"data": [{"id": 1}], "meta": {"next_cursor": 5}}),
+            httpx.Response(200, json={"data": [{"id": 2}], "meta": {}}),
+        ])
+        games = asyncio.run(fetch_bdl_games(bdl))
+        assert [g["id"] for g in games] == [1, 2]
+
+
+class TestPartitionedFetch:
+    def test_round_windows_cover_the_range(self):
+        assert date_partitions("2026-05-01", "2026-05-09") == [
+            ("2026-05-01", "2026-05-04"), ("2026-05-05", "2026-05-09"),
+        ]
+        windows = date_partitions("2026-04-14", None)
+        assert windows[0] == ("2026-04-14", "2026-04-17")
+        assert windows[-1][1] is None
+
+    def test_fixed_day_buckets(self):
+        assert date_partitions("2026-05-01", "2026-05-09", partition_days=4) == [
+            ("2026-05-01", "2026-05-04"), ("2026-05-05", "2026-05-08"), ("2026-05-09", "2026-05-09"),
+        ]
+
+    def test_windows_are_fetched_and_deduplicated(self, monkeypatch):
+        def handler(request):
+            start = request.url.params["start_date"]
+            # game 2 straddles the boundary and is returned by both windows
+            games = {
+                "2026-04-14": [make_game(1, "BOS", "NYK", "2026-04-14T23:00:00Z"),
+                               make_game(2, "BOS", "NYK", "2026-04-17T23:00:00Z")],
+                "2026-04-18": [make_game(2, "BOS", "NYK", "2026-04-17T23:00:00Z"),
+                               make_game(3, "BOS", "NYK", "2026-04-19T23:00:00Z")],
+            }.get(start, [])
+            return httpx.Response(200, json={"data": games, "meta": {}})
+
+        async def no_sleep(_s):
+            pass
+
+        monkeypatch.setattr(sync, "INCREMENTAL_SYNC", False)
+        monkeypatch.setattr(sync, "BDL_PARALLEL_FETCH", True)
+        monkeypatch.setattr(sync, "BDL_PARTITION_DAYS", 4)
+        bdl = BdlClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            requests_per_minute=6000, burst=100, sleep=no_sleep,
+        )
+        started_at = datetime(2026, 4, 20, tzinfo=timezone.utc)
+        games, _ = asyncio.run(sync._fetch_games(True, started_at, bdl=bdl))
+
+        assert sorted(g.id for g in games) == [1, 2, 3]
+        windows = date_partitions(PLAYOFFS_START_DATE, None, partition_days=4)
+        assert windows[1][0] == "2026-04-18"
+        assert bdl.stats["requests"] == len(windows)
+
+
+class TestStreamBdlGames:
+    def _client(self, handler):
+        async def no_sleep(_s):
+            pass
+
+        return BdlClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            requests_per_minute=6000, burst=100, sleep=no_sleep, max_retries=0,
+        )
+
+    def test_yields_each_page_as_it_arrives(self):
+        def handler(request):
+            cursor = request.url.params.get("cursor")
+            if cursor is None:
+                return httpx.Response(200, json={"data": [{"id": 1}], "meta": {"next_cursor": 2}})
+            return httpx.Response(200, json={"data": [{"id": 2}], "meta": {}})
+
+        async def collect():
+            return [page async for page in stream_bdl_games(self._client(handler), [("2026-05-01", None)])]
+
+        assert asyncio.run(collect()) == [[{"id": 1}], [{"id": 2}]]
+
+    def test_window_failure_is_raised(self):
+        def handler(request):
+            if request.url.params["start_date"] == "2026-05-05":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"data": [{"id": 1}], "meta": {}})
+
+        async def collect():
+            windows = [("2026-05-01", "2026-05-04"), ("2026-05-05", "2026-05-09")]
+            return [page async for page in stream_bdl_games(self._client(handler), windows)]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(collect())
+
+
+class TestBdlResponseCache:
+    def _client(self, tmp_path, handler):
+        async def no_sleep(_s):
+            pass
+
+        return BdlClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            requests_per_minute=6000, burst=100, sleep=no_sleep,
+            cache=ResponseCache(tmp_path),
+        )
+
+    def test_fresh_entry_skips_the_network(self, tmp_path):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"data": [{"id": 1}]})
+
+        bdl = self._client(tmp_path, handler)
+
+        async def twice():
+            first = await bdl.get("/games", {"a": 1}, cache_ttl=lambda _b: 60)
+            second = await bdl.get("/games", {"a": 1}, cache_ttl=lambda _b: 60)
+            return first, second
+
+        first, second = asyncio.run(twice())
+        assert first == second == {"data": [{"id": 1}]}
+        assert len(requests) == 1
+        assert bdl.cache.stats["hits"] == 1 and bdl.cache.stats["misses"] == 1
+
+    def test_stale_entry_is_revalidated_with_etag(self, tmp_path):
+        seen_etags = []
+
+        def handler(request):
+            seen_etags.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"data": [{"id": 1}]}, headers={"ETag": '"v1"'})
+
+        bdl = self._client(tmp_path, handler)
+
+        async def twice():
+            await bdl.get("/games", None, cache_ttl=lambda _b: 0)
+            return await bdl.get("/games", None, cache_ttl=lambda _b: 0)
+
+        assert asyncio.run(twice()) == {"data": [{"id": 1}]}
+        assert seen_etags == [None, '"v1"']
+        assert bdl.cache.stats["revalidated"] == 1
+
+    def test_page_ttl_policy(self):
+        today = date(2026, 5, 10)
+        final = {"data": [{"status": "Final"}, {"status": "Final"}]}
+        mixed = {"data": [{"status": "Final"}, {"status": "2nd Qtr"}]}
+
+        assert page_cache_ttl("2026-05-04", today)(final) == math.inf
+        assert page_cache_ttl("2026-05-04", today)(mixed) == BDL_CACHE_PAST_TTL_S
+        assert page_cache_ttl("2026-05-09", today)(mixed) == BDL_CACHE_TTL_S
+        assert page_cache_ttl("2026-05-12", today)(final) == BDL_CACHE_TTL_S
+        assert page_cache_ttl(None, today)(final) == BDL_CACHE_TTL_S
+
+
+class TestTokenBucket:
+    def test_paces_requests_beyond_burst(self):
+        now = [0.0]
+        sleeps: list[float] = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0])
+
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire(fake_sleep)
+
+        asyncio.run(take(4))
+        # two tokens from the burst, then one every 0.5 s
+        assert sleeps == [0.5, 0.5]
+
+
+# ---------------------------------------------------------------------------
+# Daemon mode
+# ---------------------------------------------------------------------------
+
+class TestDaemon:
+    def test_polls_fast_while_games_are_live(self):
+        now = datetime(2026, 5, 10, 23, 0, tzinfo=timezone.utc)
+        assert next_interval({"games_live": 2, "next_start": None}, now) == DAEMON_LIVE_INTERVAL_S
+
+    def test_sleeps_until_shortly_before_tip_off(self):
+        now = datetime(2026, 5, 10, 23, 0, tzinfo=timezone.utc)
+        soon = "2026-05-10T23:20:00+00:00"
+        later = "2026-05-11T23:00:00+00:00"
+        started = "2026-05-10T22:55:00+00:00"
+
+        assert next_interval({"games_live": 0, "next_start": soon}, now) == min(
+            DAEMON_IDLE_INTERVAL_S, max(DAEMON_LIVE_INTERVAL_S, 20 * 60 - DAEMON_PREGAME_LEAD_S)
+        )
+        assert next_interval({"games_live": 0, "next_start": later}, now) == DAEMON_IDLE_INTERVAL_S
+        assert next_interval({"games_live": 0, "next_start": started}, now) == DAEMON_LIVE_INTERVAL_S
+        assert next_interval({"games_live": 0, "next_start": None}, now) == DAEMON_IDLE_INTERVAL_S
+
+    def test_failures_back_off(self):
+        assert failure_interval(1) == DAEMON_LIVE_INTERVAL_S
+        assert failure_interval(2) == min(DAEMON_IDLE_INTERVAL_S, 2 * DAEMON_LIVE_INTERVAL_S)
+        assert failure_interval(50) == DAEMON_IDLE_INTERVAL_S
+
+    def test_keeps_state_between_ticks_and_stops_cleanly(self, monkeypatch):
+        invalidations = []
+        seen_states = []
+        full_flags = []
+        closed = []
+
+        class FakeDb:
+            async def aclose(self):
+                closed.append(True)
+
+        class CountingStore(StateStore):
+            def invalidate(self):
+                invalidations.append(len(seen_states))
+                super().invalidate()
+
+        async def fake_sync_all(full_resync, db, bdl, state):
+            seen_states.append(state)
+            full_flags.append(full_resync)
+            if len(seen_states) == 2:
+                raise RuntimeError("boom")
+            if len(seen_states) == 3:
+                stop.set()
+            return {"games_live": 1, "next_start": None}
+
+        monkeypatch.setattr(daemon, "AsyncSupabase", FakeDb)
+        monkeypatch.setattr(daemon, "StateStore", CountingStore)
+        monkeypatch.setattr(daemon, "sync_all", fake_sync_all)
+        monkeypatch.setattr(daemon, "DAEMON_LIVE_INTERVAL_S", 0)
+
+        stop = None
+
+        async def main():
+            nonlocal stop
+            stop = asyncio.Event()
+            await daemon.run_daemon(stop, full_resync=True)
+
+        asyncio.run(main())
+
+        assert len(seen_states) == 3
+        assert seen_states[0] is seen_states[1] is seen_states[2]
+        # only the failed second tick forces a reload
+        assert invalidations == [2]
+        # a full resync is only done once
+        assert full_flags == [True, False, False]
+        assert closed == [True]
+
+
+class TestLiveScores:
+    def _run(self, games, stored):
+        writes = []
+
+        class FakeDb:
+            async def fetch_events_by_parent(self, parent_ids):
+                return [e for e in stored if e["parentEvent"] in parent_ids]
+
+            async def update_events(self, updates):
+                writes.extend(updates)
+                return len(updates), []
+
+        def handler(request):
+            return httpx.Response(200, json={"data": games, "meta": {}})
+
+        async def no_sleep(seconds):
+            pass
+
+        bdl = BdlClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            requests_per_minute=6000, burst=100, sleep=no_sleep,
+        )
+        now = datetime(2026, 5, 11, 1, 0, tzinfo=timezone.utc)
+        return asyncio.run(refresh_live_scores(FakeDb(), bdl, now=now)), writes
+
+    def test_writes_only_changed_in_progress_scores(self):
+        games = [
+            make_game(1, "BOS", "NYK", "2026-05-10T23:00:00Z", status="3rd Qtr", period=3,
+                      home_score=70, visitor_score=65),
+            make_game(2, "OKC", "DEN", "2026-05-10T23:30:00Z", status="2nd Qtr", period=2,
+                      home_score=40, visitor_score=44),
+            make_game(3, "LAL", "GSW", "2026-05-10T20:00:00Z", status="Final", period=4,
+                      home_score=101, visitor_score=99),
+            make_game(4, "MIA", "ORL", "2026-05-11T00:30:00Z", status="1st Qtr", period=1,
+                      home_score=2, visitor_score=0),
+        ]
+        stored = [
+            {"id": "e1", "parentEvent": "1", "status": STATUS_IN_PROGRESS, "team1Score": 68, "team2Score": 65},
+            {"id": "e2", "parentEvent": "2", "status": STATUS_IN_PROGRESS, "team1Score": 40, "team2Score": 44},
+            # not yet moved to in progress by the full run: left alone
+            {"id": "e4", "parentEvent": "4", "status": STATUS_UPCOMING, "team1Score": None, "team2Score": None},
+        ]
+        result, writes = self._run(games, stored)
+
+        assert result["live_games"] == 3
+        assert result["finished_game_ids"] == ["3"]
+        assert result["scores_updated"] == 1
+        assert result["periods"] == {"e1": 3, "e2": 2}
+        assert [(row["id"], changes) for row, changes in writes] == [("e1", {"team1Score": 70})]
+
+    def test_no_live_games_skips_the_database(self):
+        games = [make_game(1, "BOS", "NYK", "2026-05-11T23:00:00Z")]
+        result, writes = self._run(games, [])
+
+        assert result["live_games"] == 0
+        assert writes == []
+
+    def test_daemon_runs_full_tick_once_a_live_game_finishes(self, monkeypatch):
+        refreshes = []
+
+        async def fake_refresh(db, bdl):
+            refreshes.append(1)
+            # an unrelated game finished earlier; game 2 goes Final on the third refresh
+            finished = ["7"] if len(refreshes) < 3 else ["7", "2"]
+            return {"live_games": 2 if len(refreshes) < 3 else 1, "finished_game_ids": finished,
+                    "scores_updated": 0, "failures": [], "periods": {}, "elapsed_s": 0.0}
+
+        monkeypatch.setattr(daemon, "refresh_live_scores", fake_refresh)
+        monkeypatch.setattr(daemon, "LIVE_SCORE_INTERVAL_S", 0.001)
+
+        async def main():
+            await daemon.wait_for_next_tick(asyncio.Event(), 60, ["1", "2"], None, None)
+
+        asyncio.run(main())
+        assert len(refreshes) == 3
+
+    def test_live_game_outside_the_refresh_window_does_not_end_the_wait(self, monkeypatch):
+        refreshes = []
+
+        async def fake_refresh(db, bdl):
+            refreshes.append(1)
+            # game 9 (stale, days old) never appears in today's window
+            return {"live_games": 0, "finished_game_ids": [], "scores_updated": 0,
+                    "failures": [], "periods": {}, "elapsed_s": 0.0}
+
+        monkeypatch.setattr(daemon, "refresh_live_scores", fake_refresh)
+        monkeypatch.setattr(daemon, "LIVE_SCORE_INTERVAL_S", 0.02)
+
+        async def main():
+            await daemon.wait_for_next_tick(asyncio.Event(), 0.1, ["9"], None, None)
+
+        asyncio.run(main())
+        assert len(refreshes) >= 2
+
+
+class TestPlanner:
+    def test_tip_offs_expected_finals_and_bet_deadlines(self):
+        now = datetime(2026, 5, 10, 22, 0, tzinfo=timezone.utc)
+        events = [
+            {"id": "g1", "eventType": "game", "status": STATUS_UPCOMING, "startTime": "2026-05-10T23:00:00Z"},
+            {"id": "s1", "eventType": "series", "status": STATUS_UPCOMING, "startTime": "2026-05-10T23:00:00+00:00"},
+            {"id": "g2", "eventType": "game", "status": STATUS_IN_PROGRESS, "startTime": "2026-05-10T18:00:00Z"},
+            {"id": "g3", "eventType": "game", "status": STATUS_RESOLVED, "startTime": "2026-05-09T23:00:00Z"},
+            {"id": "g4", "eventType": "game", "status": STATUS_UPCOMING, "startTime": "2026-05-12"},
+            # never went in progress, long past its expected final
+            {"id": "g5", "eventType": "game", "status": STATUS_UPCOMING, "startTime": "2026-05-09T18:00:00Z"},
+        ]
+        plan = plan_wakeups(events, now)
+
+        assert plan["next_wake"] == now.isoformat()
+        assert [(w["at"], w["reasons"], w["event_ids"]) for w in plan["wakes"]] == [
+            # g2 is past its expected final: due now
+            ("2026-05-10T22:00:00+00:00", ["expected_final"], ["g2"]),
+            ("2026-05-10T23:00:00+00:00", ["tip_off", "bet_close"], ["g1", "s1"]),
+            ("2026-05-11T01:30:00+00:00", ["expected_final"], ["g1"]),
+        ]
+
+    def test_nothing_to_do(self):
+        plan = plan_wakeups([], datetime(2026, 5, 10, tzinfo=timezone.utc))
+        assert plan["next_wake"] is None and plan["wakes"] == []
+
+    def test_daemon_wakes_for_the_planned_time(self):
+        now = datetime(2026, 5, 10, 23, 0, tzinfo=timezone.utc)
+        wake = "2026-05-10T23:10:00+00:00"
+        assert next_interval({"games_live": 0, "next_start": None, "next_wake": wake}, now) == min(
+            DAEMON_IDLE_INTERVAL_S, max(DAEMON_LIVE_INTERVAL_S, 600)
+        )
+
+
+    def test_build_plan_closes_the_client_it_creates(self, monkeypatch):
+        closed = []
+
+        class FakeDb:
+            async def fetch_existing_events(self):
+                return [{"id": "g1", "eventType": "game", "status": STATUS_UPCOMING,
+                         "startTime": "2026-05-10T23:00:00Z"}]
+
+            async def aclose(self):
+                closed.append(self)
+
+        monkeypatch.setattr(planner, "AsyncSupabase", FakeDb)
+        now = datetime(2026, 5, 10, 22, 0, tzinfo=timezone.utc)
+        plan = asyncio.run(planner.build_plan(now=now))
+        assert plan["next_wake"] == "2026-05-10T23:00:00+00:00"
+        assert len(closed) == 1
+
+        # a client passed in belongs to the caller
+        asyncio.run(planner.build_plan(FakeDb(), now=now))
+        assert len(closed) == 1
+
+
+class TestStateStore:
+    class FakeDb:
+        def __init__(self, events, users=("u1",)):
+            self.events = events
+            self.users = list(users)
+            self.calls = []
+
+        async def fetch_existing_events(self):
+            self.calls.append("events")
+            return [dict(e) for e in self.events]
+
+        async def fetch_events_changed_since(self, column, since):
+            self.calls.append(("events_since", since))
+            return [dict(e) for e in self.events if e.get(column) is not None and e[column] >= since]
+
+        async def fetch_existing_bet_pairs(self):
+            self.calls.append("bet_pairs")
+            return BetPairIndex([("g1", "u1")])
+
+        async def fetch_all_user_ids(self):
+            self.calls.append("users")
+            return list(self.users)
+
+    def test_loads_once_then_refreshes_only_changed_events(self):
+        db = self.FakeDb([
+            {"id": "g1", "parentEvent": "g1", "status": STATUS_UPCOMING, "updated_at": "2026-05-01T10:00:00+00:00"},
+            {"id": "g2", "parentEvent": "g2", "status": STATUS_UPCOMING, "updated_at": "2026-05-02T10:00:00+00:00"},
+        ])
+        store = StateStore("updated_at")
+        first = asyncio.run(store.refresh(db))
+        assert first["events_mode"] == "full"
+        assert ("g1", "u1") in first["bet_pairs"]
+
+        db.events[0] = {**db.events[0], "status": STATUS_IN_PROGRESS, "updated_at": "2026-05-03T10:00:00+00:00"}
+        db.users.append("u2")
+        db.calls.clear()
+        second = asyncio.run(store.refresh(db))
+
+        assert second["events_mode"] == "incremental"
+        assert db.calls == [("events_since", "2026-05-02T10:00:00+00:00"), "users"]
+        assert second["events_by_parent"]["g1"]["status"] == STATUS_IN_PROGRESS
+        assert set(second["events_by_parent"]) == {"g1", "g2"}
+        assert second["user_ids"] == ["u1", "u2"]
+        assert store.watermark == "2026-05-03T10:00:00+00:00"
+
+    def test_falls_back_to_full_reload_without_change_column(self):
+        db = self.FakeDb([{"id": "g1", "parentEvent": "g1", "status": STATUS_UPCOMING}])
+        store = StateStore("updated_at")
+        asyncio.run(store.refresh(db, include_users=False))
+        db.calls.clear()
+        snapshot = asyncio.run(store.refresh(db, include_users=False))
+
+        assert snapshot["events_mode"] == "full"
+        assert db.calls == ["events"]
+
+    def test_applies_own_writes_and_invalidates(self):
+        db = self.FakeDb([
+            {"id": "g1", "parentEvent": "g1", "status": STATUS_UPCOMING, "updated_at": "1"},
+            {"id": "g2", "parentEvent": "g2", "status": STATUS_UPCOMING, "updated_at": "1"},
+        ])
+        store = StateStore("updated_at")
+        snapshot = asyncio.run(store.refresh(db))
+        by_parent = snapshot["events_by_parent"]
+        store.apply_event_updates(
+            [(by_parent["g1"], {"status": STATUS_RESOLVED}), (by_parent["g2"], {"status": STATUS_RESOLVED})],
+            failed_ids=["g2"],
+        )
+        store.apply_events([{"id": "s1", "parentEvent": "s1", "status": STATUS_UPCOMING}])
+
+        assert store.events_by_parent["g1"]["status"] == STATUS_RESOLVED
+        assert store.events_by_parent["g2"]["status"] == STATUS_UPCOMING
+        assert "s1" in store.events_by_parent
+
+        store.invalidate()
+        db.calls.clear()
+        asyncio.run(store.refresh(db))
+        assert db.calls == ["events", "bet_pairs", "users"]
+        assert "s1" not in store.events_by_parent
+
+
+class TestSqliteStore:
+    def _db(self):
+        client = sqlite_store.connect(path=":memory:")
+        client.executemany('insert into users ("uuid", "is_active") values (?, ?)',
+                           [("u1", 1), ("u2", 1), ("u3", 0)])
+        return AsyncSupabase(client, backend=sqlite_store)
+
+    def _event(self, event_id: str, status: int = STATUS_UPCOMING, season: int | None = None) -> dict:
+        return {
+            "id": event_id, "team1": "Celtics", "team2": "Lakers", "team1Score": 0, "team2Score": 0,
+            "startTime": "2026-05-10T23:00:00Z", "parentEvent": event_id, "status": status,
+            "eventType": "game", "round": "secondRound", "gameNumber": 1,
+            "season": APP_SEASON if season is None else season,
+        }
+
+    def test_backends_implement_the_same_interface(self):
+        for name in BACKEND_FUNCTIONS:
+            ours = list(inspect.signature(getattr(sqlite_store, name)).parameters)[1:]
+            theirs = list(inspect.signature(getattr(supabase_client, name)).parameters)[1:]
+            assert ours[:len(theirs)] == theirs, name
+
+    def test_events_round_trip_and_changed_since(self):
+        async def scenario():
+            db = self._db()
+            inserted = await db.insert_events([self._event("e1"), self._event("e2"), self._event("old", season=2020)])
+            assert {e["id"] for e in inserted} == {"e1", "e2", "old"}
+            assert {e["id"] for e in await db.fetch_existing_events()} == {"e1", "e2"}
+            mark = max(e["updated_at"] for e in inserted)
+            await asyncio.sleep(0.01)
+
+            stored = {e["id"]: e for e in await db.fetch_events_by_parent(["e1", "e2"])}
+            written, failures = await db.update_events([
+                (stored["e1"], {"status": STATUS_RESOLVED, "team1Score": 110}),
+                (stored["e2"], {}),
+            ])
+            assert (written, failures) == (1, [])
+            [e1] = await db.fetch_events_by_parent(["e1"])
+            # the update trigger bumps updated_at past every untouched row
+            [touched] = [e for e in await db.fetch_existing_events() if e["id"] == "e1"]
+            assert touched["updated_at"] > mark
+            return await db.fetch_events_changed_since("updated_at", touched["updated_at"]), e1
+
+        changed, e1 = asyncio.run(scenario())
+        assert [e["id"] for e in changed] == ["e1"]
+        assert (e1["status"], e1["team1Score"]) == (STATUS_RESOLVED, 110)
+
+    def test_bets_follow_the_supabase_semantics(self):
+        async def scenario():
+            db = self._db()
+            await db.insert_events([self._event("e1", STATUS_RESOLVED), self._event("e2"),
+                                    self._event("old", STATUS_RESOLVED, season=2020)])
+            rows = [{"eventId": ev, "userId": u, "closeTime": None, "eventType": "game", "calcFunc": "secondRound"}
+                    for ev in ("e1", "e2", "old") for u in ("u1", "u2")]
+            assert await db.insert_bets(rows) == 6
+            assert await db.insert_bets(rows[:3], skip_conflicts=True) == 0
+            db.client.execute('update bets set "winnerTeam" = ?, "winMargin" = 5 where "userId" = ?', ("Celtics", "u1"))
+
+            pairs = await db.fetch_existing_bet_pairs()
+            unscored = await db.fetch_unscored_resolved_event_ids()
+            groups = dict([group async for group in db.iter_event_bets(["e2", "e1"])])
+            await db.update_bets_points([(bet["id"], {"pointsGained": 2, "pointsGainedWinMargin": 0})
+                                         for bet in groups["e1"]])
+            return pairs, unscored, groups, await db.fetch_unscored_resolved_event_ids(), db
+
+        pairs, unscored, groups, after, db = asyncio.run(scenario())
+        # the events!inner(season) join drops the other season's bets
+        assert len(pairs) == 4 and ("old", "u1") not in pairs
+        assert unscored == ["e1"]
+        # only placed bets, grouped in eventId order
+        assert list(groups) == ["e1", "e2"]
+        assert [b["userId"] for b in groups["e1"]] == ["u1"]
+        assert after == []
+        assert db.stats["insert_bets"]["calls"] == 2
+        assert db.client.stats["queries"] > 0
+
+    def test_event_updates_keep_concurrent_database_edits(self):
+        async def scenario():
+            db = self._db()
+            [stored] = await db.insert_events([self._event("e1")])
+            # someone fixes the round while the run holds its snapshot
+            db.client.execute('update events set "round" = ? where "id" = ?', ("firstRound", "e1"))
+            await db.update_events([(stored, {"status": STATUS_RESOLVED})])
+            return await db.fetch_events_by_parent(["e1"])
+
+        [row] = asyncio.run(scenario())
+        assert (row["status"], row["round"]) == (STATUS_RESOLVED, "firstRound")
+
+    def test_different_event_changes_share_one_statement(self):
+        async def scenario():
+            db = self._db()
+            inserted = await db.insert_events([self._event(f"e{i}") for i in range(3)])
+            db.client.by_kind.clear()
+            written, failures = await db.update_events(
+                [(row, {"team1Score": 100 + i}) for i, row in enumerate(inserted[:2])]
+                + [(inserted[2], {"team2Score": 90, "status": STATUS_RESOLVED})]
+            )
+            return written, failures, dict(db.client.by_kind), await db.fetch_events_by_parent(["e0", "e1", "e2"])
+
+        written, failures, by_kind, rows = asyncio.run(scenario())
+        assert (written, failures) == (3, [])
+        assert by_kind == {"update": 1}
+        by_id = {row["id"]: row for row in rows}
+        assert [by_id[f"e{i}"]["team1Score"] for i in range(2)] == [100, 101]
+        assert (by_id["e2"]["team2Score"], by_id["e2"]["status"]) == (90, STATUS_RESOLVED)
+        # columns missing from a row keep their stored value
+        assert (by_id["e0"]["team2Score"], by_id["e0"]["status"]) == (0, STATUS_UPCOMING)
+        assert by_id["e2"]["team1Score"] == 0
+
+    def test_failed_event_update_rows_are_reported(self):
+        async def scenario():
+            db = self._db()
+            [stored] = await db.insert_events([self._event("e1")])
+            return await db.update_events([(stored, {"status": None})])
+
+        written, failures = asyncio.run(scenario())
+        assert written == 0
+        assert [event_id for event_id, _ in failures] == ["e1"]
+
+    def test_unknown_backend_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(async_db, "STORAGE_BACKEND", "mongo")
+        with pytest.raises(ValueError):
+            async_db.default_backend()
+
+
+class TestSyncAllBdlFailures:
+    def _run(self, monkeypatch, exc):
+        async def failing_fetch(*args, **kwargs):
+            raise exc
+
+        monkeypatch.setattr(sync, "_fetch_games", failing_fetch)
+        db = AsyncSupabase(sqlite_store.connect(path=":memory:"), backend=sqlite_store)
+        asyncio.run(sync.sync_all(db=db))
+
+    def test_budget_exceeded_is_reported_and_reraised(self, monkeypatch, capsys):
+        with pytest.raises(BdlBudgetExceeded):
+            self._run(monkeypatch, BdlBudgetExceeded("BallDontLie request budget of 3 exhausted"))
+        assert "request budget of 3 exhausted" in "".join(capsys.readouterr())
+
+    def test_http_error_is_reported_and_reraised(self, monkeypatch, capsys):
+        request = httpx.Request("GET", "https://api.balldontlie.io/v1/games")
+        response = httpx.Response(503, text="upstream down", request=request)
+        with pytest.raises(httpx.HTTPStatusError):
+            self._run(monkeypatch, httpx.HTTPStatusError("503", request=request, response=response))
+        assert "BallDontLie API error 503: upstream down" in "".join(capsys.readouterr())
+
+
+class TestSyncAllSeriesUpdates:
+    def test_series_row_whose_id_differs_from_its_parent_event(self, monkeypatch):
+        games = [
+            Game.from_bdl(make_game(1, "Celtics", "Lakers", "2026-04-20T23:00:00Z", status="Final",
+                                    period=4, home_score=110, visitor_score=100)),
+            Game.from_bdl(make_game(2, "Celtics", "Lakers", "2026-04-22T23:00:00Z")),
+        ]
+
+        async def fake_fetch(*args, **kwargs):
+            return games, "2 games"
+
+        monkeypatch.setattr(sync, "_fetch_games", fake_fetch)
+        client = sqlite_store.connect(path=":memory:")
+        db = AsyncSupabase(client, backend=sqlite_store)
+
+        async def scenario():
+            await db.insert_events([{
+                "id": "row-42", "team1": "Celtics", "team2": "Lakers", "team1Score": 0, "team2Score": 0,
+                "startTime": "2026-04-20T23:00:00Z", "parentEvent": "series_Celtics_Lakers",
+                "status": STATUS_UPCOMING, "eventType": "series", "round": "firstRound",
+                "gameNumber": 0, "season": APP_SEASON,
+            }])
+            summary = await sync.sync_all(db=db)
+            [row] = await db.fetch_events_by_parent(["series_Celtics_Lakers"])
+            return summary, row
+
+        summary, row = asyncio.run(scenario())
+        assert summary["series_updated"] == 1
+        assert (row["id"], row["team1Score"], row["status"]) == ("row-42", 1, STATUS_IN_PROGRESS)
+
+    def _run_twice(self, monkeypatch):
+        games = [
+            Game.from_bdl(make_game(1, "Celtics", "Lakers", "2026-04-20T23:00:00Z", status="Final",
+                                    period=4, home_score=110, visitor_score=100)),
+            Game.from_bdl(make_game(2, "Celtics", "Lakers", "2026-04-22T23:00:00Z")),
+        ]
+
+        async def fake_fetch(*args, **kwargs):
+            return games, "2 games"
+
+        monkeypatch.setattr(sync, "_fetch_games", fake_fetch)
+        db = AsyncSupabase(sqlite_store.connect(path=":memory:"), backend=sqlite_store)
+
+        async def scenario():
+            await sync.sync_all(db=db)
+            return await sync.sync_all(db=db)
+
+        return asyncio.run(scenario())
+
+    def test_unchanged_games_count_as_skipped_writes(self, monkeypatch):
+        summary = self._run_twice(monkeypatch)
+
+        # both games and the series were already up to date
+        assert (summary["events_updated"], summary["series_updated"]) == (0, 0)
+        assert summary["updates_skipped"] == 3
+
+    def test_special_update_without_a_stored_row_is_skipped(self, monkeypatch):
+        def fake_special_events(*args, **kwargs):
+            return [], [("finalsMvp", {"status": STATUS_RESOLVED})]
+
+        monkeypatch.setattr(sync, "build_special_events", fake_special_events)
+        summary = self._run_twice(monkeypatch)
+
+        assert summary["update_failures"] == 0
@@ -0,0 +1,15 @@
+"""
+Timing helper shared by the pipeline (sync.py) and the daemon's state store.
+"""
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+async def timed(awaitable: Awaitable[T]) -> tuple[T, float]:
+    """Await awaitable and return (result, seconds it took)."""
+    t0 = time.monotonic()
+    result = await awaitable
+    return result, time.monotonic() - t0